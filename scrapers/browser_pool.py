@@ -0,0 +1,185 @@
+"""
+DataFlow Pro - Browser Page Pool
+
+Bounded pool of pre-warmed Playwright contexts and pages. Each slot owns
+its own browser context, configured once with headers and route handlers,
+so workers borrow a ready page instead of paying for page creation and
+teardown on every URL. Slots are recycled after a fixed number of uses or
+when the page's JS heap grows past a threshold, which keeps Chromium memory
+flat on long URL lists.
+
+Author: [Your Name]
+Date: 2024
+"""
+
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Awaitable, Callable, Dict, List, Optional
+
+from playwright.async_api import Browser, BrowserContext, Page
+
+logger = logging.getLogger(__name__)
+
+ContextSetup = Callable[[BrowserContext], Awaitable[None]]
+
+JS_HEAP_SCRIPT = "() => (performance.memory ? performance.memory.usedJSHeapSize : 0)"
+
+
+class _PooledPage:
+    """A page and the context that owns it."""
+
+    __slots__ = ('context', 'page', 'uses')
+
+    def __init__(self, context: BrowserContext, page: Page):
+        self.context = context
+        self.page = page
+        self.uses = 0
+
+
+class PagePool:
+    """
+    Fixed-size pool of reusable pages.
+
+    Usage:
+        pool = PagePool(browser, size=5, headers={'User-Agent': '...'})
+        await pool.start()
+        async with pool.page() as page:
+            await page.goto(url)
+        await pool.close()
+    """
+
+    def __init__(self,
+                 browser: Browser,
+                 size: int,
+                 headers: Optional[Dict[str, str]] = None,
+                 context_setup: Optional[ContextSetup] = None,
+                 max_uses_per_page: int = 50,
+                 max_heap_mb: float = 200,
+                 memory_check_every: int = 10,
+                 replace_attempts: int = 2):
+        """
+        Initialize the pool.
+
+        Args:
+            browser: Launched Playwright browser
+            size: Number of pages kept open
+            headers: Extra HTTP headers applied to every context
+            context_setup: Coroutine run once per new context, e.g. to
+                install route handlers
+            max_uses_per_page: Recycle a slot after this many borrows
+            max_heap_mb: Recycle a slot when its JS heap exceeds this size
+            memory_check_every: Sample the JS heap every N uses
+            replace_attempts: Tries at opening a recycled slot's
+                replacement before the pool shrinks by one
+        """
+        self.browser = browser
+        self.size = size
+        self.headers = headers or {}
+        self.context_setup = context_setup
+        self.max_uses_per_page = max_uses_per_page
+        self.max_heap_bytes = max_heap_mb * 1024 * 1024
+        self.memory_check_every = max(1, memory_check_every)
+        self.replace_attempts = max(1, replace_attempts)
+
+        self._idle: asyncio.Queue = asyncio.Queue(maxsize=size)
+        self._slots: List[_PooledPage] = []
+        self.stats = {
+            'pages_created': 0,
+            'pages_recycled': 0,
+            'pages_lost': 0,
+            'borrows': 0
+        }
+
+    async def start(self):
+        """Pre-warm every slot."""
+        slots = await asyncio.gather(*(self._new_slot() for _ in range(self.size)))
+        for slot in slots:
+            self._idle.put_nowait(slot)
+        logger.info(f"Page pool ready with {self.size} pages")
+
+    async def _new_slot(self) -> _PooledPage:
+        context = await self.browser.new_context(extra_http_headers=self.headers)
+        if self.context_setup:
+            await self.context_setup(context)
+        page = await context.new_page()
+
+        slot = _PooledPage(context, page)
+        self._slots.append(slot)
+        self.stats['pages_created'] += 1
+        return slot
+
+    async def _close_slot(self, slot: _PooledPage):
+        if slot in self._slots:
+            self._slots.remove(slot)
+        try:
+            await slot.context.close()
+        except Exception as e:
+            logger.debug(f"Error closing pooled context: {e}")
+
+    async def _should_recycle(self, slot: _PooledPage) -> bool:
+        if slot.page.is_closed():
+            return True
+        if slot.uses >= self.max_uses_per_page:
+            return True
+        if slot.uses % self.memory_check_every == 0:
+            try:
+                heap = await slot.page.evaluate(JS_HEAP_SCRIPT)
+            except Exception:
+                # A page that cannot run a trivial script is not worth keeping
+                return True
+            if heap > self.max_heap_bytes:
+                logger.info(f"Recycling page with {heap / 1024 / 1024:.0f}MB JS heap")
+                return True
+        return False
+
+    async def _replace_slot(self) -> Optional[_PooledPage]:
+        for attempt in range(1, self.replace_attempts + 1):
+            try:
+                return await self._new_slot()
+            except Exception as e:
+                logger.warning(f"Could not open replacement page "
+                               f"(attempt {attempt}/{self.replace_attempts}): {e}")
+        return None
+
+    def _shrink(self):
+        self.size -= 1
+        self.stats['pages_lost'] += 1
+        logger.error(f"Page pool shrunk to {self.size} pages")
+        if self.size == 0:
+            # Wake borrowers waiting on a pool that can no longer serve them
+            self._idle.put_nowait(None)
+
+    async def _release(self, slot: _PooledPage):
+        slot.uses += 1
+        live = slot
+        try:
+            if await self._should_recycle(slot):
+                live = None
+                await self._close_slot(slot)
+                self.stats['pages_recycled'] += 1
+                live = await self._replace_slot()
+        finally:
+            # Only live slots go back; a closed one would fail every borrower
+            if live is not None:
+                self._idle.put_nowait(live)
+            else:
+                self._shrink()
+
+    @asynccontextmanager
+    async def page(self) -> AsyncIterator[Page]:
+        """Borrow a page for the duration of the block."""
+        slot = await self._idle.get()
+        if slot is None:
+            self._idle.put_nowait(None)
+            raise RuntimeError("Page pool has no pages left")
+        self.stats['borrows'] += 1
+        try:
+            yield slot.page
+        finally:
+            await self._release(slot)
+
+    async def close(self):
+        """Close every context owned by the pool."""
+        for slot in list(self._slots):
+            await self._close_slot(slot)
@@ -0,0 +1,229 @@
+"""
+DataFlow Pro - Hashed Naive Bayes Categoriser
+
+Trainable replacement for the keyword categoriser in DataProcessor.
+Words are hashed into a fixed number of feature buckets, so there is no
+vocabulary to store, and a multinomial naive Bayes model is fitted on
+labelled `processed_data` rows. The model is a single small .npz file.
+
+Inference works on a whole chunk at once. The token features of every
+document are concatenated into one array, and each class's
+log-likelihoods are summed per document with a single np.bincount.
+
+Training:
+    python categoriser.py --output categoriser_model.npz
+
+DataProcessor only uses a model when CATEGORISER_MODEL_PATH points at it.
+
+Author: [Your Name]
+Date: 2024
+"""
+
+import argparse
+import logging
+import os
+import zlib
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from keyword_matcher import KeywordMatcher
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_FEATURES = 2 ** 16
+
+# Labels that mean "no category"; not used for training
+UNLABELLED = frozenset({'', 'general'})
+
+
+class HashedNaiveBayes:
+    """
+    Multinomial naive Bayes over hashed word features.
+
+    Usage:
+        model = HashedNaiveBayes.train(texts, labels)
+        model.save('categoriser_model.npz')
+        categories, confidences = HashedNaiveBayes.load(path).predict(texts)
+    """
+
+    def __init__(self,
+                 classes: Sequence[str],
+                 feature_log_prob: np.ndarray,
+                 class_log_prior: np.ndarray):
+        """
+        Wrap fitted parameters.
+
+        Args:
+            classes: Category names, one per row of feature_log_prob
+            feature_log_prob: log P(feature | class), classes x features
+            class_log_prior: log P(class)
+        """
+        self.classes = np.asarray(classes)
+        self.feature_log_prob = np.asarray(feature_log_prob, dtype=np.float32)
+        self.class_log_prior = np.asarray(class_log_prior, dtype=np.float64)
+        self.n_features = self.feature_log_prob.shape[1]
+        # Word -> bucket; words repeat heavily across documents
+        self._bucket_cache: Dict[str, int] = {}
+
+    def _featurize(self, documents: Iterable[List[str]]) -> Tuple[np.ndarray, np.ndarray, int]:
+        """
+        Hash a batch of tokenized documents into one flat feature array.
+
+        Returns:
+            (feature bucket per token, document index per token, documents)
+        """
+        tokens: List[str] = []
+        lengths: List[int] = []
+        for document in documents:
+            tokens.extend(document)
+            lengths.append(len(document))
+
+        # Hash each distinct word once; crc32, unlike hash(), is the same in
+        # every process and run
+        cache = self._bucket_cache
+        if len(cache) > 1_000_000:
+            cache.clear()
+        for token in set(tokens).difference(cache):
+            cache[token] = zlib.crc32(token.encode()) % self.n_features
+
+        features = np.fromiter(map(cache.__getitem__, tokens), dtype=np.int64, count=len(tokens))
+        documents = np.repeat(np.arange(len(lengths)), lengths)
+        return features, documents, len(lengths)
+
+    @classmethod
+    def train(cls,
+              texts: Sequence[str],
+              labels: Sequence[str],
+              n_features: int = DEFAULT_FEATURES,
+              alpha: float = 1.0) -> "HashedNaiveBayes":
+        """
+        Fit a model.
+
+        Args:
+            texts: Training documents
+            labels: Category per document
+            n_features: Hash buckets
+            alpha: Additive (Laplace) smoothing
+        """
+        classes, label_index = np.unique(np.asarray(labels), return_inverse=True)
+        model = cls(classes, np.zeros((len(classes), n_features), dtype=np.float32), np.zeros(len(classes)))
+
+        features, documents, _ = model._featurize(KeywordMatcher.tokenize(text) for text in texts)
+        token_class = label_index[documents]
+
+        # Token counts per (class, bucket) in one bincount
+        counts = np.bincount(
+            token_class * n_features + features,
+            minlength=len(classes) * n_features
+        ).reshape(len(classes), n_features).astype(np.float64)
+
+        smoothed = counts + alpha
+        model.feature_log_prob = np.log(smoothed / smoothed.sum(axis=1, keepdims=True)).astype(np.float32)
+        model.class_log_prior = np.log(np.bincount(label_index, minlength=len(classes)) / len(labels))
+        return model
+
+    def predict_proba(self, documents: Sequence[List[str]]) -> np.ndarray:
+        """Class probabilities for tokenized documents, documents x classes."""
+        features, documents, n_documents = self._featurize(documents)
+
+        # Joint log-likelihood: per class, sum the log-probs of each
+        # document's tokens with one bincount over the flat token array
+        token_log_prob = self.feature_log_prob[:, features]
+        joint = np.empty((n_documents, len(self.classes)))
+        for c in range(len(self.classes)):
+            joint[:, c] = np.bincount(documents, weights=token_log_prob[c], minlength=n_documents)
+        joint += self.class_log_prior
+
+        joint -= joint.max(axis=1, keepdims=True)
+        probabilities = np.exp(joint)
+        probabilities /= probabilities.sum(axis=1, keepdims=True)
+        return probabilities
+
+    def predict_tokens(self, documents: Sequence[List[str]]) -> Tuple[List[str], List[float]]:
+        """
+        Categorise a batch of documents already split by KeywordMatcher.tokenize.
+
+        Returns:
+            (category per document, probability of that category)
+        """
+        if not len(documents):
+            return [], []
+        probabilities = self.predict_proba(documents)
+        best = probabilities.argmax(axis=1)
+        return self.classes[best].tolist(), probabilities[np.arange(len(best)), best].tolist()
+
+    def predict(self, texts: Sequence[str]) -> Tuple[List[str], List[float]]:
+        """Categorise a batch of texts."""
+        return self.predict_tokens([KeywordMatcher.tokenize(text) for text in texts])
+
+    def save(self, path: str):
+        """Write the model to an .npz file."""
+        np.savez_compressed(
+            path,
+            classes=self.classes.astype(str),
+            feature_log_prob=self.feature_log_prob,
+            class_log_prior=self.class_log_prior
+        )
+
+    @classmethod
+    def load(cls, path: str) -> "HashedNaiveBayes":
+        """Read a model written by save()."""
+        with np.load(path, allow_pickle=False) as data:
+            return cls(data['classes'], data['feature_log_prob'], data['class_log_prior'])
+
+
+def load_labelled_rows(supabase, page_size: int = 1000) -> Tuple[List[str], List[str]]:
+    """
+    Read (text, category) training pairs from processed_data.
+
+    Rows are paged by record_id with a keyset rather than OFFSET.
+    """
+    texts: List[str] = []
+    labels: List[str] = []
+    last_id: Optional[str] = None
+
+    while True:
+        query = supabase.table("processed_data").select("record_id, title, description, category")
+        if last_id is not None:
+            query = query.gt("record_id", last_id)
+        rows = query.order("record_id").limit(page_size).execute().data or []
+
+        for row in rows:
+            category = (row.get('category') or '').strip()
+            if category.lower() in UNLABELLED:
+                continue
+            texts.append(f"{row.get('title') or ''} {row.get('description') or ''}")
+            labels.append(category)
+
+        if len(rows) < page_size:
+            return texts, labels
+        last_id = rows[-1]['record_id']
+
+
+def main():
+    """Train a model from processed_data and save it."""
+    from dotenv import load_dotenv
+    from supabase import create_client
+
+    parser = argparse.ArgumentParser(description="Train the hashed naive Bayes categoriser")
+    parser.add_argument('--output', default=os.environ.get("CATEGORISER_MODEL_PATH", "categoriser_model.npz"))
+    parser.add_argument('--features', type=int, default=DEFAULT_FEATURES)
+    parser.add_argument('--alpha', type=float, default=1.0)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    load_dotenv()
+    supabase = create_client(os.environ["SUPABASE_URL"], os.environ["SUPABASE_SERVICE_ROLE_KEY"])
+
+    texts, labels = load_labelled_rows(supabase)
+    if len(set(labels)) < 2:
+        raise SystemExit(f"Need at least two labelled categories, found {sorted(set(labels))}")
+
+    model = HashedNaiveBayes.train(texts, labels, n_features=args.features, alpha=args.alpha)
+    model.save(args.output)
+    logger.info(f"Trained on {len(texts)} rows, {len(model.classes)} categories; saved to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,205 @@
+"""
+DataFlow Pro - Adaptive Concurrency Control
+
+AIMD (additive increase, multiplicative decrease) limiter for crawl
+workers. The limit grows by a fixed step after every window of healthy
+responses and is cut by a factor as soon as the target shows distress
+(timeouts, 429s or 5xx), the same way TCP congestion control probes for
+capacity.
+
+Author: [Your Name]
+Date: 2024
+"""
+
+import asyncio
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Deque, Dict, Optional, Set, Tuple
+
+
+class AdaptiveConcurrencyLimiter:
+    """
+    Concurrency limiter whose limit follows observed latency and errors.
+
+    Usage:
+        limiter = AdaptiveConcurrencyLimiter(initial_limit=5)
+        async with limiter.slot():
+            ...
+            limiter.record(latency, status=200)
+    """
+
+    def __init__(self,
+                 initial_limit: int = 5,
+                 min_limit: int = 1,
+                 max_limit: int = 20,
+                 target_latency: float = 5.0,
+                 increase_step: int = 1,
+                 decrease_factor: float = 0.5,
+                 window: int = 20,
+                 max_error_rate: float = 0.1,
+                 cooldown: float = 5.0,
+                 history_size: int = 50):
+        """
+        Initialize the limiter.
+
+        Args:
+            initial_limit: Starting number of concurrent workers
+            min_limit: Floor for the limit
+            max_limit: Ceiling for the limit
+            target_latency: Mean latency (seconds) above which the limit
+                stops growing and starts shrinking
+            increase_step: Added to the limit after a healthy window
+            decrease_factor: Multiplier applied on overload signals
+            window: Completed requests evaluated per adjustment
+            max_error_rate: Error share of a window still considered healthy
+            cooldown: Seconds after a decrease during which further
+                overload signals are ignored, so one burst of failures
+                only halves the limit once
+            history_size: Number of recent adjustments kept for stats
+        """
+        self.min_limit = max(1, min_limit)
+        self.max_limit = max(self.min_limit, max_limit)
+        self.limit = min(self.max_limit, max(self.min_limit, initial_limit))
+        self.target_latency = target_latency
+        self.increase_step = increase_step
+        self.decrease_factor = decrease_factor
+        self.window = window
+        self.max_error_rate = max_error_rate
+        self.cooldown = cooldown
+
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self._condition = asyncio.Condition()
+        self._samples: Deque[Tuple[float, bool]] = deque(maxlen=window)
+        self._saturated = False
+        self._last_decrease = float('-inf')
+        self._started = time.monotonic()
+        # The event loop only keeps weak references to tasks
+        self._notify_tasks: Set[asyncio.Task] = set()
+        self.history: Deque[Dict[str, Any]] = deque(maxlen=history_size)
+        self.counters = {
+            'requests': 0,
+            'errors': 0,
+            'timeouts': 0,
+            'throttled': 0,
+            'server_errors': 0,
+            'increases': 0,
+            'decreases': 0
+        }
+
+    @asynccontextmanager
+    async def slot(self) -> AsyncIterator[None]:
+        """Hold one concurrency slot for the duration of the block."""
+        async with self._condition:
+            await self._condition.wait_for(lambda: self.in_flight < self.limit)
+            self.in_flight += 1
+            self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+            if self.in_flight >= self.limit:
+                self._saturated = True
+        try:
+            yield
+        finally:
+            async with self._condition:
+                self.in_flight -= 1
+                self._condition.notify_all()
+
+    def record(self,
+               latency: float,
+               status: Optional[int] = None,
+               timeout: bool = False,
+               error: bool = False):
+        """
+        Feed the outcome of one request into the controller.
+
+        Args:
+            latency: Seconds the request took
+            status: HTTP status, if a response was received
+            timeout: The request timed out
+            error: The request failed for another reason
+        """
+        self.counters['requests'] += 1
+
+        reason = None
+        if timeout:
+            self.counters['timeouts'] += 1
+            reason = 'timeout'
+        elif status == 429:
+            self.counters['throttled'] += 1
+            reason = 'status 429'
+        elif status is not None and status >= 500:
+            self.counters['server_errors'] += 1
+            reason = f'status {status}'
+
+        failed = reason is not None or error
+        if failed:
+            self.counters['errors'] += 1
+        self._samples.append((latency, failed))
+
+        if reason is not None:
+            self._decrease(reason)
+            return
+
+        if len(self._samples) < self.window:
+            return
+
+        error_rate = sum(1 for _, bad in self._samples if bad) / len(self._samples)
+        mean_latency = sum(lat for lat, _ in self._samples) / len(self._samples)
+
+        if mean_latency > self.target_latency:
+            self._set_limit(self.limit - self.increase_step,
+                            f'mean latency {mean_latency:.2f}s above target')
+        elif error_rate <= self.max_error_rate and self._saturated:
+            # Only probe upwards when the current limit was actually reached
+            self._set_limit(self.limit + self.increase_step,
+                            f'healthy window (mean latency {mean_latency:.2f}s, '
+                            f'error rate {error_rate:.0%})')
+        self._samples.clear()
+        self._saturated = False
+
+    def _decrease(self, reason: str):
+        now = time.monotonic()
+        if now - self._last_decrease < self.cooldown:
+            return
+        self._last_decrease = now
+        self._set_limit(int(self.limit * self.decrease_factor), reason)
+        self._samples.clear()
+
+    def _set_limit(self, new_limit: int, reason: str):
+        new_limit = min(self.max_limit, max(self.min_limit, new_limit))
+        if new_limit == self.limit:
+            return
+
+        self.counters['increases' if new_limit > self.limit else 'decreases'] += 1
+        self.history.append({
+            'at': round(time.monotonic() - self._started, 3),
+            'from': self.limit,
+            'to': new_limit,
+            'reason': reason
+        })
+        raised = new_limit > self.limit
+        self.limit = new_limit
+
+        # Wake waiters so a raised limit is used immediately; a lowered one
+        # cannot let anyone in. Waiters re-check the predicate, so a
+        # spurious wake-up is harmless.
+        if raised:
+            task = asyncio.ensure_future(self._notify())
+            self._notify_tasks.add(task)
+            task.add_done_callback(self._notify_tasks.discard)
+
+    async def _notify(self):
+        async with self._condition:
+            self._condition.notify_all()
+
+    def stats(self) -> Dict[str, Any]:
+        """Current limit, counters and recent adjustments."""
+        return {
+            'limit': self.limit,
+            'min_limit': self.min_limit,
+            'max_limit': self.max_limit,
+            'in_flight': self.in_flight,
+            'peak_in_flight': self.peak_in_flight,
+            **self.counters,
+            'adjustments': list(self.history)
+        }
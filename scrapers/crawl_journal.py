@@ -0,0 +1,138 @@
+"""
+DataFlow Pro - Crawl Journal
+
+Local SQLite checkpoint store for collection jobs. Every URL of a job is
+recorded as pending, in flight, done or failed together with its attempt
+count, so a job that crashes or is killed can resume: completed URLs are
+skipped and only unfinished or failed ones are retried.
+
+Author: [Your Name]
+Date: 2024
+"""
+
+import logging
+from datetime import datetime, timezone
+from typing import Dict, Iterable, Iterator, Optional
+
+from sqlite_store import SQLiteStore
+
+logger = logging.getLogger(__name__)
+
+PENDING = 'pending'
+IN_FLIGHT = 'in_flight'
+DONE = 'done'
+FAILED = 'failed'
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS crawl_journal (
+    job_id TEXT NOT NULL,
+    url TEXT NOT NULL,
+    status TEXT NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    last_error TEXT,
+    updated_at TEXT NOT NULL,
+    PRIMARY KEY (job_id, url)
+);
+CREATE INDEX IF NOT EXISTS idx_crawl_journal_status ON crawl_journal (job_id, status);
+"""
+
+
+class CrawlJournal(SQLiteStore):
+    """
+    Persisted per-URL progress for one collection job.
+
+    Writes are committed immediately so the journal is accurate up to the
+    moment a process dies. WAL mode keeps those small commits cheap.
+    """
+
+    def __init__(self, path: str, job_id: str):
+        """
+        Open (or create) the journal.
+
+        Args:
+            path: SQLite database file
+            job_id: Identifies the job; one file can hold several jobs
+        """
+        super().__init__(path, SCHEMA)
+        self.job_id = job_id
+
+    @staticmethod
+    def _now() -> str:
+        return datetime.now(timezone.utc).isoformat()
+
+    def _execute(self, sql: str, params: tuple = ()):
+        with self._lock:
+            self._conn.execute(sql, params)
+            self._conn.commit()
+
+    def register(self, urls: Iterable[str]):
+        """Add URLs to the job as pending; already-known URLs keep their state."""
+        now = self._now()
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO crawl_journal (job_id, url, status, updated_at) "
+                "VALUES (?, ?, ?, ?)",
+                ((self.job_id, url, PENDING, now) for url in urls)
+            )
+            self._conn.commit()
+
+    def resumable(self, urls: Iterable[str], max_attempts: int) -> Iterator[str]:
+        """
+        Yield the URLs that still need work.
+
+        Done URLs are skipped, as are failed ones that have used up their
+        attempts. URLs left in flight by a crashed run count as unfinished.
+        """
+        with self._lock:
+            finished = {
+                url for url, status, attempts in self._conn.execute(
+                    "SELECT url, status, attempts FROM crawl_journal WHERE job_id = ?",
+                    (self.job_id,)
+                )
+                if status == DONE or (status == FAILED and attempts >= max_attempts)
+            }
+
+        for url in urls:
+            if url not in finished:
+                yield url
+
+    def mark_in_flight(self, url: str):
+        """Record the start of an attempt."""
+        self._execute(
+            "INSERT INTO crawl_journal (job_id, url, status, attempts, updated_at) "
+            "VALUES (?, ?, ?, 1, ?) "
+            "ON CONFLICT (job_id, url) DO UPDATE SET "
+            "status = excluded.status, attempts = attempts + 1, updated_at = excluded.updated_at",
+            (self.job_id, url, IN_FLIGHT, self._now())
+        )
+
+    def mark_done(self, url: str):
+        """Record a successful attempt."""
+        self._execute(
+            "UPDATE crawl_journal SET status = ?, last_error = NULL, updated_at = ? "
+            "WHERE job_id = ? AND url = ?",
+            (DONE, self._now(), self.job_id, url)
+        )
+
+    def mark_failed(self, url: str, error: Optional[str] = None):
+        """Record a failed attempt."""
+        self._execute(
+            "UPDATE crawl_journal SET status = ?, last_error = ?, updated_at = ? "
+            "WHERE job_id = ? AND url = ?",
+            (FAILED, error, self._now(), self.job_id, url)
+        )
+
+    def summary(self) -> Dict[str, int]:
+        """Count URLs per status."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT status, COUNT(*) FROM crawl_journal WHERE job_id = ? GROUP BY status",
+                (self.job_id,)
+            ).fetchall()
+        counts = {PENDING: 0, IN_FLIGHT: 0, DONE: 0, FAILED: 0}
+        counts.update(dict(rows))
+        return counts
+
+    def reset(self):
+        """Forget the job, e.g. once it has completed successfully."""
+        self._execute("DELETE FROM crawl_journal WHERE job_id = ?", (self.job_id,))
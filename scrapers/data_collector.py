@@ -3,6 +3,9 @@ DataFlow Pro - Intelligent Data Collection Engine
 
 This module demonstrates advanced web scraping capabilities including:
 - Asynchronous data collection
+- Multi-process sharded crawling across CPU cores
+- Streaming results with bounded memory
+- HTTP-first fetching with a headless browser fallback
 - Intelligent content parsing
 - Robust error handling
 - Rate limiting and respectful crawling
@@ -16,17 +19,31 @@ Date: 2024
 import asyncio
 import hashlib
 import logging
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import asynccontextmanager
 from datetime import datetime, timedelta, timezone
-from typing import Dict, List, Optional, Any
+from typing import Any, AsyncIterator, Dict, Iterable, List, Optional, Tuple
 from urllib.parse import urljoin, urlparse
 
-from playwright.async_api import async_playwright, Browser, Page
+from playwright.async_api import async_playwright, Browser, Page, TimeoutError as PlaywrightTimeoutError
 from dotenv import load_dotenv
 import os
 
 # Database imports
 from supabase import create_client, Client
 
+from browser_pool import PagePool
+from concurrency import AdaptiveConcurrencyLimiter
+from crawl_journal import CrawlJournal
+from http_fetcher import StaticFetcher
+from metrics import MetricsRegistry, RunProfiler
+from rate_limiter import HostRateLimiter
+from resource_filter import ResourceFilter
+from revalidation_cache import RevalidationCache
+from write_behind import WriteBehindQueue
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -41,12 +58,19 @@ logger = logging.getLogger(__name__)
 # Load environment variables
 load_dotenv()
 
+# Marks the end of a streamed crawl
+_STREAM_DONE = object()
+
+# Returned for URLs whose content is known to be unchanged since the last run
+_NOT_MODIFIED = object()
+
 class DataCollector:
     """
     Advanced data collection engine with intelligent scraping capabilities.
     
     Features:
     - Asynchronous processing for high performance
+    - Static HTTP fetching first, Playwright only for pages that need it
     - Intelligent content parsing and categorization
     - Robust error handling and retry mechanisms
     - Rate limiting and respectful crawling
@@ -69,8 +93,88 @@ class DataCollector:
         # Configuration
         self.max_retries = 3
         self.retry_delay = 2
-        self.rate_limit_delay = 1
+        self.user_agent = 'DataFlow-Pro/1.0 (Respectful Crawler)'
+        
+        # Adaptive concurrency: starts at max_concurrent_pages and moves
+        # between the min/max bounds based on latency and error signals
         self.max_concurrent_pages = 5
+        self.min_concurrency = 1
+        self.max_concurrency = 20
+        self.target_latency = 5.0
+        
+        # Per-host politeness budget, enforced before a page slot is taken.
+        # host_rate_overrides maps hostname -> (requests per second, burst).
+        self.host_rate_limit = 1.0
+        self.host_burst = 2
+        self.host_rate_overrides: Dict[str, Tuple[float, int]] = {}
+        
+        # Fetch strategy: 'http_first' tries a plain HTTP request and only
+        # renders in Chromium when the static page lacks content;
+        # 'browser' always renders.
+        self.fetch_mode = 'http_first'
+        self.http_timeout = 15
+        self.min_static_content_length = 200
+        self.static_expected_xpath: Optional[str] = None
+        
+        # Browser page pool: pages are reused across URLs and recycled
+        # after N uses or once their JS heap grows past the threshold
+        self.browser_pool_size = 5
+        self.page_max_uses = 50
+        self.page_max_heap_mb = 200
+        
+        # Abort images, fonts, media, stylesheets and analytics in the
+        # browser; per-source exceptions live in resource_filter.SOURCE_ALLOWLISTS
+        self.block_resources = True
+        
+        # Write-behind persistence: records are queued and written in
+        # batches on a worker thread so crawling and database writes overlap
+        self.db_batch_size = 100
+        self.write_queue_size = 1000
+        self.write_flush_interval = 2.0
+        self.flush_on_shutdown = True
+        
+        # Records buffered between crawl workers and a streaming consumer
+        self.stream_buffer_size = 100
+        
+        # Worker processes used by run_collection_job; each shard gets its
+        # own browser and event loop. 1 keeps everything in-process.
+        self.worker_processes = 1
+        
+        # Crawl journal used by run_collection_job to resume interrupted
+        # jobs; a URL is attempted at most max_retries times across runs
+        self.journal_path = os.environ.get("CRAWL_JOURNAL_PATH", "crawl_journal.sqlite3")
+        
+        # HTTP validator cache for conditional GETs on repeat crawls;
+        # set to None to always download pages in full
+        self.revalidation_cache_path: Optional[str] = os.environ.get(
+            "REVALIDATION_CACHE_PATH", "revalidation_cache.sqlite3"
+        )
+        
+        # Stage timings and counters, exported at the end of each
+        # run_collection_job: Prometheus text, or a JSON snapshot when the
+        # path ends in .json; None only logs a summary
+        self.metrics_path: Optional[str] = os.environ.get("COLLECTOR_METRICS_PATH")
+        
+        # Opt-in per-run profiling: 'cprofile', 'tracemalloc' or both,
+        # comma-separated; output files go to profile_dir
+        self.profile_modes = os.environ.get("DATAFLOW_PROFILE", "")
+        self.profile_dir = os.environ.get("PROFILE_DIR", "profiles")
+        
+        # Statistics for the most recent collect_data run
+        self.stats: Dict[str, Any] = {}
+        self.metrics = MetricsRegistry('collector', labels={'source': source_id})
+        
+        # Per-run crawl state, set up by collect_data
+        self._http_fetcher: Optional[StaticFetcher] = None
+        self._browser: Optional[Browser] = None
+        self._page_pool: Optional[PagePool] = None
+        self._resource_filter: Optional[ResourceFilter] = None
+        self._concurrency: Optional[AdaptiveConcurrencyLimiter] = None
+        self._journal: Optional[CrawlJournal] = None
+        self._revalidation_cache: Optional[RevalidationCache] = None
+        self._browser_launcher = None
+        self._browser_lock: Optional[asyncio.Lock] = None
+        self._rate_limiter: Optional[HostRateLimiter] = None
         
     def _initialize_database(self) -> Client:
         """Initialize Supabase client for data persistence."""
@@ -120,50 +224,118 @@ class DataCollector:
         """Generate a hash for content deduplication."""
         return hashlib.sha256(content.encode('utf-8')).hexdigest()
     
-    async def _check_existing_record(self, record_id: str) -> Optional[Dict]:
-        """Check if a record already exists in the database."""
-        try:
-            response = self.supabase.table("collected_data").select("*").eq(
-                "record_id", record_id
-            ).limit(1).execute()
-            
-            return response.data[0] if response.data else None
-        except Exception as e:
-            logger.error(f"Database query failed: {e}")
-            return None
+    def _prefetch_content_hashes(self, record_ids: List[str]) -> Dict[str, str]:
+        """Fetch stored content hashes for a chunk of records in one query."""
+        response = self.supabase.table("collected_data").select(
+            "record_id, content_hash"
+        ).in_("record_id", record_ids).execute()
+        
+        return {row['record_id']: row.get('content_hash') for row in response.data or []}
     
-    async def _save_record(self, data: Dict[str, Any]):
-        """Save a record to the database."""
-        try:
-            # Prepare data for database
-            db_data = {
-                'record_id': data.get('id'),
-                'title': data.get('title'),
-                'description': data.get('description'),
-                'url': data.get('url'),
-                'source_id': self.source_id,
-                'content_hash': data.get('content_hash'),
-                'metadata': data.get('metadata', {}),
-                'collected_at': datetime.now(timezone.utc).isoformat()
-            }
-            
-            # Check if record exists
-            existing = await self._check_existing_record(data.get('id'))
-            
-            if existing:
-                if existing.get('content_hash') != data.get('content_hash'):
-                    logger.info(f"Updating existing record: {data.get('id')}")
-                    self.supabase.table("collected_data").update(db_data).eq(
-                        "record_id", data.get('id')
-                    ).execute()
-                else:
-                    logger.info(f"Record unchanged: {data.get('id')}")
-            else:
-                logger.info(f"Inserting new record: {data.get('id')}")
-                self.supabase.table("collected_data").insert(db_data).execute()
+    def _to_db_row(self, data: Dict[str, Any], collected_at: str) -> Dict[str, Any]:
+        """Prepare a collected record for the database."""
+        return {
+            'record_id': data.get('id'),
+            'title': data.get('title'),
+            'description': data.get('description'),
+            'url': data.get('url'),
+            'source_id': self.source_id,
+            'content_hash': data.get('content_hash'),
+            'metadata': data.get('metadata', {}),
+            'collected_at': collected_at
+        }
+    
+    def _write_records(self, batch: List[Dict[str, Any]]) -> int:
+        """
+        Write records to the database in batches. Blocking; run it off the event loop.
+        
+        Each chunk of db_batch_size records costs one IN query to prefetch
+        stored content hashes and one upsert for the rows that changed, so
+        round trips scale with the number of chunks rather than records.
+        
+        Returns:
+            Number of records persisted, written or already up to date;
+            the write-behind queue counts the rest of the batch as failed
+        """
+        saved_ids = set()
+        
+        # Later duplicates win; an upsert cannot touch the same row twice
+        unique = {data.get('id'): data for data in batch if data.get('id')}
+        records = list(unique.values())
+        
+        for i in range(0, len(records), self.db_batch_size):
+            chunk = records[i:i + self.db_batch_size]
+            try:
+                with self.metrics.time('db_read'):
+                    existing = self._prefetch_content_hashes([data['id'] for data in chunk])
                 
-        except Exception as e:
-            logger.error(f"Failed to save record: {e}")
+                # Stamped right before the upsert: incremental processing
+                # pages by this column and tolerates commits up to its
+                # safety_lag late
+                collected_at = datetime.now(timezone.utc).isoformat()
+                rows = [
+                    self._to_db_row(data, collected_at)
+                    for data in chunk
+                    if data['id'] not in existing or existing[data['id']] != data.get('content_hash')
+                ]
+                
+                if rows:
+                    with self.metrics.time('db_write'):
+                        self.supabase.table("collected_data").upsert(
+                            rows, on_conflict='record_id'
+                        ).execute()
+                saved_ids.update(data['id'] for data in chunk)
+                
+                # A URL only counts as done, and its validators are only
+                # cached, once its record is persisted
+                if self._journal:
+                    for data in chunk:
+                        self._journal.mark_done(data['url'])
+                if self._revalidation_cache:
+                    self._revalidation_cache.store_many(
+                        (data['url'],
+                         data.get('metadata', {}).get('etag'),
+                         data.get('metadata', {}).get('last_modified'),
+                         data.get('content_hash'))
+                        for data in chunk
+                    )
+                
+                logger.info(f"Saved batch of {len(chunk)} records: "
+                           f"{len(rows)} written, {len(chunk) - len(rows)} unchanged")
+            except Exception as e:
+                logger.error(f"Failed to save batch of {len(chunk)} records: {e}")
+                if self._journal:
+                    for data in chunk:
+                        self._journal.mark_failed(data['url'], f"save failed: {e}")
+        
+        # Superseded duplicates of a saved record count as persisted
+        return sum(1 for data in batch if data.get('id') in saved_ids)
+    
+    def _build_record(self, url: str, title: str, content: str) -> Dict[str, Any]:
+        """Build a collected record from extracted page title and content."""
+        with self.metrics.time('hash'):
+            # Generate content hash for deduplication
+            content_hash = self._generate_content_hash(content)
+            
+            # Generate unique record ID
+            record_id = hashlib.md5(f"{url}{title}".encode()).hexdigest()
+        
+        # Extract metadata
+        metadata = {
+            'url': url,
+            'title': title,
+            'content_length': len(content),
+            'extracted_at': datetime.now(timezone.utc).isoformat()
+        }
+        
+        return {
+            'id': record_id,
+            'title': title,
+            'description': content[:500] + "..." if len(content) > 500 else content,
+            'url': url,
+            'content_hash': content_hash,
+            'metadata': metadata
+        }
     
     async def _extract_page_data(self, page: Page, url: str) -> Dict[str, Any]:
         """
@@ -173,80 +345,333 @@ class DataCollector:
         """
         try:
             # Wait for page to load
-            await page.wait_for_load_state('networkidle')
-            
-            # Extract basic page information
-            title = await page.title()
-            
-            # Extract main content (customize based on target site structure)
-            content_elements = await page.query_selector_all('main, article, .content, .main')
-            
-            content = ""
-            if content_elements:
-                content = await content_elements[0].inner_text()
-            else:
-                # Fallback to body content
-                body = await page.query_selector('body')
-                if body:
-                    content = await body.inner_text()
-            
-            # Generate content hash for deduplication
-            content_hash = self._generate_content_hash(content)
-            
-            # Extract metadata
-            metadata = {
-                'url': url,
-                'title': title,
-                'content_length': len(content),
-                'extracted_at': datetime.now(timezone.utc).isoformat()
-            }
+            with self.metrics.time('wait'):
+                await page.wait_for_load_state('networkidle')
             
-            # Generate unique record ID
-            record_id = hashlib.md5(f"{url}{title}".encode()).hexdigest()
+            with self.metrics.time('extract'):
+                # Extract basic page information
+                title = await page.title()
+                
+                # Extract main content (customize based on target site structure)
+                content_elements = await page.query_selector_all('main, article, .content, .main')
+                
+                content = ""
+                if content_elements:
+                    content = await content_elements[0].inner_text()
+                else:
+                    # Fallback to body content
+                    body = await page.query_selector('body')
+                    if body:
+                        content = await body.inner_text()
             
-            return {
-                'id': record_id,
-                'title': title,
-                'description': content[:500] + "..." if len(content) > 500 else content,
-                'url': url,
-                'content_hash': content_hash,
-                'metadata': metadata
-            }
+            return self._build_record(url, title, content)
             
         except Exception as e:
             logger.error(f"Failed to extract data from {url}: {e}")
             return None
     
-    async def _process_url(self, browser: Browser, url: str) -> Optional[Dict]:
-        """Process a single URL and extract data."""
-        page = None
-        try:
-            page = await browser.new_page()
-            
-            # Set user agent for respectful crawling
-            await page.set_extra_http_headers({
-                'User-Agent': 'DataFlow-Pro/1.0 (Respectful Crawler)'
-            })
-            
-            # Navigate to page with timeout
-            await page.goto(url, wait_until='networkidle', timeout=30000)
-            
-            # Rate limiting
-            await asyncio.sleep(self.rate_limit_delay)
+    async def _get_page_pool(self) -> PagePool:
+        """Launch the browser and warm the page pool on first use so static-only runs never start Chromium."""
+        async with self._browser_lock:
+            if self._page_pool is None:
+                logger.info("Launching browser for pages that need rendering")
+                self._browser = await self._browser_launcher.chromium.launch(
+                    headless=True,
+                    args=['--no-sandbox', '--disable-dev-shm-usage']
+                )
+                if self.block_resources:
+                    self._resource_filter = ResourceFilter.for_source(self.source_id)
+                pool = PagePool(
+                    self._browser,
+                    size=self.browser_pool_size,
+                    # Set user agent for respectful crawling
+                    headers={'User-Agent': self.user_agent},
+                    context_setup=self._resource_filter.install if self._resource_filter else None,
+                    max_uses_per_page=self.page_max_uses,
+                    max_heap_mb=self.page_max_heap_mb
+                )
+                await pool.start()
+                self._page_pool = pool
+            return self._page_pool
+    
+    @staticmethod
+    def _is_overloaded(status: Optional[int]) -> bool:
+        """Whether a status means the host is shedding load."""
+        return status is not None and (status == 429 or status >= 500)
+    
+    @staticmethod
+    async def _off_loop(func, *args):
+        """Run a blocking journal or cache call on the default executor."""
+        return await asyncio.get_running_loop().run_in_executor(None, func, *args)
+    
+    async def _wait_for_host(self, url: str):
+        """Spend a politeness token for the URL's host."""
+        if self._rate_limiter:
+            with self.metrics.time('rate_wait'):
+                await self._rate_limiter.acquire(url)
+    
+    @asynccontextmanager
+    async def _request_slot(self) -> AsyncIterator[None]:
+        """Hold a concurrency slot for one request, timing the wait for it."""
+        waiting = time.perf_counter()
+        async with self._concurrency.slot():
+            self.metrics.observe('slot_wait', time.perf_counter() - waiting)
+            yield
+    
+    async def _fetch_static(self, url: str) -> Tuple[Any, bool]:
+        """
+        Try the static HTTP path.
+        
+        Returns:
+            The extracted record, _NOT_MODIFIED or None, and whether the URL
+            should be retried in the browser
+        """
+        cached = await self._off_loop(self._revalidation_cache.get, url) if self._revalidation_cache else None
+        
+        started = time.monotonic()
+        # Static request and parse; the counterpart of navigate + extract
+        with self.metrics.time('fetch'):
+            result = await self._http_fetcher.fetch(
+                url, headers=RevalidationCache.conditional_headers(cached)
+            )
+        self._concurrency.record(
+            time.monotonic() - started,
+            status=result.status or None,
+            timeout=result.timed_out,
+            error=result.status == 0 and not result.timed_out
+        )
+        self.stats['static_fetches'] += 1
+        
+        if self._is_overloaded(result.status) or result.timed_out:
+            # The host is struggling; rendering it in a browser would only add load
+            logger.warning(f"Skipping {url}: {result.reason}")
+            return None, False
+        
+        if result.not_modified:
+            return _NOT_MODIFIED, False
+        
+        if result.needs_browser:
+            logger.info(f"Falling back to browser for {url}: {result.reason}")
+            return None, True
+        
+        data = self._build_record(url, result.title, result.content)
+        if result.etag:
+            data['metadata']['etag'] = result.etag
+        if result.last_modified:
+            data['metadata']['last_modified'] = result.last_modified
+        
+        if cached and cached.content_hash == data['content_hash']:
+            # Server does not support validators (or changed them) but the
+            # content is identical to what was saved last time
+            if (cached.etag, cached.last_modified) != (result.etag, result.last_modified):
+                await self._off_loop(
+                    self._revalidation_cache.store_many,
+                    [(url, result.etag, result.last_modified, data['content_hash'])]
+                )
+            return _NOT_MODIFIED, False
+        
+        return data, False
+    
+    async def _fetch_with_browser(self, url: str) -> Optional[Dict]:
+        """Render a page in Chromium and extract its data."""
+        pool = await self._get_page_pool()
+        async with pool.page() as page:
+            self.stats['browser_fetches'] += 1
+            started = time.monotonic()
+            try:
+                # Navigate to page with timeout
+                with self.metrics.time('navigate'):
+                    response = await page.goto(url, wait_until='networkidle', timeout=30000)
+            except PlaywrightTimeoutError:
+                self._concurrency.record(time.monotonic() - started, timeout=True)
+                raise
+            except Exception:
+                self._concurrency.record(time.monotonic() - started, error=True)
+                raise
+            
+            status = response.status if response else None
+            self._concurrency.record(time.monotonic() - started, status=status)
+            if self._is_overloaded(status):
+                logger.warning(f"Skipping {url}: status {status}")
+                return None
             
             # Extract data
-            data = await self._extract_page_data(page, url)
-            
-            if data:
-                await self._save_record(data)
-                return data
+            return await self._extract_page_data(page, url)
+    
+    async def _process_url(self, url: str) -> Optional[Dict]:
+        """
+        Process a single URL and extract data.
+        
+        Each request spends a host token before it takes a concurrency slot
+        (and, for the browser, a pooled page), so a throttled host never
+        holds capacity other hosts could use. The browser fallback is a
+        second request to the host and pays for its own token.
+        """
+        try:
+            data, use_browser = None, True
+            if self.fetch_mode == 'http_first':
+                await self._wait_for_host(url)
+                async with self._request_slot():
+                    data, use_browser = await self._fetch_static(url)
+            
+            if data is None and use_browser:
+                await self._wait_for_host(url)
+                async with self._request_slot():
+                    data = await self._fetch_with_browser(url)
+            
+            return data
                 
         except Exception as e:
             logger.error(f"Failed to process {url}: {e}")
             return None
+    
+    async def iter_collected(self, urls: Iterable[str]) -> AsyncIterator[Dict]:
+        """
+        Crawl URLs and yield records as soon as they are extracted.
+        
+        Workers pull from the URL iterable lazily and hand records over
+        through a bounded buffer, so memory stays flat regardless of crawl
+        size and a slow consumer pauses the crawl instead of piling up
+        results.
+        
+        Args:
+            urls: URLs to process; may be a generator
+            
+        Yields:
+            Collected data records, in completion order
+        """
+        url_iter = iter(urls)
+        buffer: asyncio.Queue = asyncio.Queue(maxsize=self.stream_buffer_size)
+        
+        self.stats = {
+            'urls': 0,
+            'collected': 0,
+            'not_modified': 0,
+            'failed': 0,
+            'static_fetches': 0,
+            'browser_fetches': 0
+        }
+        self._concurrency = AdaptiveConcurrencyLimiter(
+            initial_limit=self.max_concurrent_pages,
+            min_limit=self.min_concurrency,
+            max_limit=self.max_concurrency,
+            target_latency=self.target_latency
+        )
+        writer = WriteBehindQueue(
+            self._write_records,
+            batch_size=self.db_batch_size,
+            flush_interval=self.write_flush_interval,
+            max_queue_size=self.write_queue_size,
+            flush_on_close=self.flush_on_shutdown,
+            name="collected_data writer"
+        )
+        
+        if self.revalidation_cache_path:
+            self._revalidation_cache = RevalidationCache(self.revalidation_cache_path)
+        
+        try:
+            async with writer, async_playwright() as p, StaticFetcher(
+                headers={'User-Agent': self.user_agent},
+                timeout=self.http_timeout,
+                max_connections=self.max_concurrency,
+                min_content_length=self.min_static_content_length,
+                expected_xpath=self.static_expected_xpath
+            ) as fetcher:
+                self._http_fetcher = fetcher
+                self._browser_launcher = p
+                self._browser_lock = asyncio.Lock()
+                
+                self._rate_limiter = HostRateLimiter(
+                    rate=self.host_rate_limit,
+                    burst=self.host_burst,
+                    overrides=self.host_rate_overrides
+                )
+                
+                async def worker():
+                    for url in url_iter:
+                        self.stats['urls'] += 1
+                        try:
+                            # Journal writes commit to disk; keep them off the event loop
+                            if self._journal:
+                                await self._off_loop(self._journal.mark_in_flight, url)
+                            with self.metrics.time('url'):
+                                data = await self._process_url(url)
+                            
+                            if data is _NOT_MODIFIED:
+                                self.stats['not_modified'] += 1
+                                if self._journal:
+                                    await self._off_loop(self._journal.mark_done, url)
+                                continue
+                            
+                            if not data:
+                                self.stats['failed'] += 1
+                                if self._journal:
+                                    await self._off_loop(self._journal.mark_failed, url, "no data extracted")
+                                continue
+                            
+                            # Both waits apply backpressure: a slow writer or a
+                            # slow consumer pauses crawling
+                            await writer.put(data)
+                            await buffer.put(data)
+                            self.stats['collected'] += 1
+                        except asyncio.CancelledError:
+                            raise
+                        except Exception as e:
+                            self.stats['failed'] += 1
+                            logger.error(f"Task failed for {url}: {e}")
+                            if self._journal:
+                                await self._off_loop(self._journal.mark_failed, url, str(e))
+                
+                # More workers than the concurrency ceiling, so workers waiting
+                # on one host's rate limit leave room for other hosts
+                workers = [asyncio.create_task(worker()) for _ in range(self.max_concurrency * 2)]
+                
+                async def finish():
+                    await asyncio.gather(*workers, return_exceptions=True)
+                    await buffer.put(_STREAM_DONE)
+                
+                finisher = asyncio.create_task(finish())
+                
+                try:
+                    while True:
+                        record = await buffer.get()
+                        if record is _STREAM_DONE:
+                            break
+                        yield record
+                finally:
+                    for task in workers + [finisher]:
+                        task.cancel()
+                    await asyncio.gather(*workers, finisher, return_exceptions=True)
+                    
+                    if self._page_pool:
+                        self.stats['page_pool'] = dict(self._page_pool.stats)
+                        await self._page_pool.close()
+                    if self._resource_filter:
+                        self.stats['resource_filter'] = dict(self._resource_filter.stats)
+                    if self._browser:
+                        await self._browser.close()
+                    self._page_pool = None
+                    self._resource_filter = None
+                    self._browser = None
+                    self._browser_launcher = None
+                    self._http_fetcher = None
+                    self._rate_limiter = None
+        
         finally:
-            if page:
-                await page.close()
+            # Closed after the writer so its final flush can still record validators
+            if self._revalidation_cache:
+                self._revalidation_cache.close()
+                self._revalidation_cache = None
+        
+        self.stats['concurrency'] = self._concurrency.stats()
+        self.stats['writer'] = dict(writer.stats)
+        for key, value in self.stats.items():
+            if isinstance(value, int):
+                self.metrics.inc(key, value)
+        for key in ('written', 'dropped', 'failed_items', 'producer_waits'):
+            self.metrics.inc(f"writer_{key}", writer.stats.get(key, 0))
+        logger.info(f"Concurrency limit ended at {self.stats['concurrency']['limit']} "
+                   f"after {len(self.stats['concurrency']['adjustments'])} adjustments")
     
     async def collect_data(self, urls: List[str]) -> List[Dict]:
         """
@@ -260,62 +685,221 @@ class DataCollector:
         """
         logger.info(f"Starting data collection for {len(urls)} URLs")
         
-        collected_data = []
+        collected_data = [record async for record in self.iter_collected(urls)]
         
-        async with async_playwright() as p:
-            browser = await p.chromium.launch(
-                headless=True,
-                args=['--no-sandbox', '--disable-dev-shm-usage']
-            )
-            
-            # Process URLs with concurrency control
-            semaphore = asyncio.Semaphore(self.max_concurrent_pages)
-            
-            async def process_with_semaphore(url):
-                async with semaphore:
-                    return await self._process_url(browser, url)
-            
-            # Create tasks for all URLs
-            tasks = [process_with_semaphore(url) for url in urls]
-            
-            # Execute tasks and collect results
-            results = await asyncio.gather(*tasks, return_exceptions=True)
-            
-            for result in results:
-                if isinstance(result, dict):
-                    collected_data.append(result)
-                elif isinstance(result, Exception):
-                    logger.error(f"Task failed: {result}")
+        logger.info(f"Data collection completed. Processed {len(collected_data)} records")
+        return collected_data
+    
+    def _settings(self) -> Dict[str, Any]:
+        """Public configuration attributes, for rebuilding this collector in a worker process."""
+        excluded = {'source_id', 'base_url', 'supabase', 'stats', 'metrics'}
+        return {
+            key: value for key, value in vars(self).items()
+            if not key.startswith('_') and key not in excluded
+        }
+    
+    def _shard_urls(self, urls: List[str], shards: int) -> Tuple[List[List[str]], List[Dict[str, Any]]]:
+        """
+        Split URLs across worker processes.
+        
+        Every host is pinned to one shard when there are enough hosts, so
+        each host's rate limit is still enforced by a single process. With
+        fewer hosts than shards a host's URLs are dealt round-robin over
+        at most its burst's worth of shards, and each of those shards gets
+        an equal slice of the host's rate and burst, so the shards together
+        never exceed the configured budget.
+        
+        Returns:
+            URL shards and the settings for each shard's worker
+        """
+        settings = self._settings()
+        by_host: Dict[str, List[str]] = {}
+        for url in urls:
+            # Keyed like HostRateLimiter, so a host lands in one budget
+            by_host.setdefault(urlparse(url).hostname or '', []).append(url)
+        buckets: List[List[str]] = [[] for _ in range(shards)]
+        overrides: List[Dict[str, Tuple[float, int]]] = [dict(self.host_rate_overrides) for _ in range(shards)]
+        
+        if len(by_host) >= shards:
+            # Largest hosts first, each onto the currently smallest shard
+            for host_urls in sorted(by_host.values(), key=len, reverse=True):
+                min(buckets, key=len).extend(host_urls)
+        else:
+            for host, host_urls in sorted(by_host.items(), key=lambda item: len(item[1]), reverse=True):
+                rate, burst = self.host_rate_overrides.get(host, (self.host_rate_limit, self.host_burst))
+                spread = max(1, min(shards, burst))
+                targets = sorted(range(shards), key=lambda i: len(buckets[i]))[:spread]
+                for i, url in enumerate(host_urls):
+                    buckets[targets[i % spread]].append(url)
+                for target in targets:
+                    overrides[target][host] = (rate / spread, max(1, burst // spread))
+        
+        return (
+            [bucket for bucket in buckets if bucket],
+            [dict(settings, host_rate_overrides=host_overrides)
+             for bucket, host_overrides in zip(buckets, overrides) if bucket]
+        )
+    
+    @staticmethod
+    def _merge_stats(shard_stats: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Sum per-shard counters into one job-level stats dict."""
+        merged: Dict[str, Any] = {}
+        for stats in shard_stats:
+            for key, value in stats.items():
+                if isinstance(value, (int, float)) and not isinstance(value, bool):
+                    merged[key] = merged.get(key, 0) + value
+        merged['shards'] = shard_stats
+        return merged
+    
+    async def collect_data_sharded(self, urls: List[str], processes: Optional[int] = None) -> List[Dict]:
+        """
+        Collect data with the URL list sharded across worker processes.
+        
+        Each process runs its own collector, browser and event loop, so
+        extraction and hashing use every core. Results and stats are merged
+        back into this collector.
+        
+        Args:
+            urls: List of URLs to process
+            processes: Worker processes; defaults to worker_processes
             
-            await browser.close()
+        Returns:
+            List of collected data records
+        """
+        processes = processes or self.worker_processes
+        shards, shard_settings = self._shard_urls(urls, processes)
+        logger.info(f"Starting sharded data collection for {len(urls)} URLs "
+                   f"across {len(shards)} processes")
         
-        logger.info(f"Data collection completed. Processed {len(collected_data)} records")
+        journal = (self._journal.path, self._journal.job_id) if self._journal else None
+        loop = asyncio.get_running_loop()
+        
+        # Spawn rather than fork: Playwright and asyncio state must not be
+        # inherited by the children
+        with ProcessPoolExecutor(
+            max_workers=len(shards),
+            mp_context=multiprocessing.get_context('spawn')
+        ) as executor:
+            outcomes = await asyncio.gather(
+                *(loop.run_in_executor(
+                    executor, _collect_shard, self.source_id, self.base_url, settings, journal, shard
+                ) for shard, settings in zip(shards, shard_settings)),
+                return_exceptions=True
+            )
+        
+        collected_data: List[Dict] = []
+        shard_stats = []
+        for shard, outcome in zip(shards, outcomes):
+            if isinstance(outcome, Exception):
+                logger.error(f"Shard of {len(shard)} URLs failed: {outcome}")
+                shard_stats.append({'urls': len(shard), 'failed': len(shard), 'error': str(outcome)})
+                continue
+            records, stats = outcome
+            collected_data.extend(records)
+            self.metrics.merge(stats.pop('metrics', {}))
+            shard_stats.append(stats)
+        
+        self.stats = self._merge_stats(shard_stats)
+        logger.info(f"Sharded data collection completed. Processed {len(collected_data)} records")
         return collected_data
     
-    async def run_collection_job(self, urls: List[str]):
+    async def run_collection_job(self, urls: List[str], resume: bool = True):
         """
         Run a complete data collection job with proper error handling and logging.
+        
+        With resume enabled, progress is checkpointed in the crawl journal.
+        A rerun after a crash or failure skips URLs that were already
+        collected and saved, and retries the rest. The collection date is
+        only advanced, and the journal cleared, once no URL is left to retry.
+        
+        Stage metrics are exported when the job ends, whether or not it
+        succeeded, and the run is profiled if profile_modes is set.
+        
+        Args:
+            urls: List of URLs to process
+            resume: Checkpoint progress and skip work finished by earlier runs
         """
         start_time = datetime.now(timezone.utc)
+        journal = CrawlJournal(self.journal_path, job_id=self.source_id) if resume else None
+        profiler = RunProfiler(
+            self.profile_modes, os.path.join(self.profile_dir, f"collector_{self.source_id}")
+        )
+        self.metrics.reset()
         
-        try:
-            logger.info(f"Starting collection job for source: {self.source_id}")
-            
-            # Collect data
-            results = await self.collect_data(urls)
-            
-            # Update collection metadata
-            await self.update_collection_date(start_time)
-            
-            logger.info(f"Collection job completed successfully. "
-                       f"Processed {len(results)} records in "
-                       f"{(datetime.now(timezone.utc) - start_time).total_seconds():.2f}s")
-            
-            return results
-            
-        except Exception as e:
-            logger.error(f"Collection job failed: {e}")
-            raise
+        with profiler:
+            try:
+                logger.info(f"Starting collection job for source: {self.source_id}")
+                
+                todo = urls
+                if journal:
+                    journal.register(urls)
+                    todo = list(journal.resumable(urls, self.max_retries))
+                    if len(todo) < len(urls):
+                        logger.info(f"Resuming job: skipping {len(urls) - len(todo)} "
+                                   f"URLs finished by an earlier run")
+                    self._journal = journal
+                
+                # Collect data
+                if self.worker_processes > 1 and len(todo) > 1:
+                    results = await self.collect_data_sharded(todo)
+                else:
+                    results = await self.collect_data(todo)
+                self.stats['skipped_by_journal'] = len(urls) - len(todo)
+                
+                remaining = list(journal.resumable(urls, self.max_retries)) if journal else []
+                if remaining:
+                    logger.warning(f"{len(remaining)} URLs unfinished; keeping journal "
+                                  f"and collection date for the next run")
+                else:
+                    # Update collection metadata
+                    await self.update_collection_date(start_time)
+                    if journal:
+                        self.stats['journal'] = journal.summary()
+                        journal.reset()
+                
+                logger.info(f"Collection job completed successfully. "
+                           f"Processed {len(results)} records in "
+                           f"{(datetime.now(timezone.utc) - start_time).total_seconds():.2f}s")
+                logger.info(f"Job stats: {self.stats}")
+                
+                return results
+                
+            except Exception as e:
+                logger.error(f"Collection job failed: {e}")
+                raise
+            finally:
+                self._journal = None
+                if journal:
+                    journal.close()
+                self.metrics.export(self.metrics_path)
+
+
+def _collect_shard(source_id: str,
+                   base_url: str,
+                   settings: Dict[str, Any],
+                   journal: Optional[Tuple[str, str]],
+                   urls: List[str]) -> Tuple[List[Dict], Dict[str, Any]]:
+    """Worker process entry point: crawl one shard with a fresh collector."""
+    collector = DataCollector(source_id, base_url)
+    collector.__dict__.update(settings)
+    if journal:
+        collector._journal = CrawlJournal(*journal)
+    
+    # Each shard profiles itself; the parent only sees the executor waits
+    profiler = RunProfiler(
+        collector.profile_modes,
+        os.path.join(collector.profile_dir, f"collector_{source_id}_shard{os.getpid()}")
+    )
+    try:
+        with profiler:
+            results = asyncio.run(collector.collect_data(urls))
+    finally:
+        if collector._journal:
+            collector._journal.close()
+    
+    stats = dict(collector.stats)
+    stats['metrics'] = collector.metrics.snapshot()
+    return results, stats
 
 
 # Example usage and demonstration
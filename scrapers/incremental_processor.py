@@ -0,0 +1,250 @@
+"""
+DataFlow Pro - Incremental Processing Runner
+
+Feeds rows from `collected_data` into DataProcessor without reprocessing
+the whole table. A watermark, the (collected_at, record_id) of the last
+processed row, is stored in `processing_metadata`. Each run reads only
+rows after it, a page at a time with keyset pagination ordered by
+(collected_at, record_id), so reading a page costs the same however deep
+into the table it is. The watermark is advanced with a single upsert once
+a page has been processed and saved, so a failed run resumes after the
+last saved page. Rows the database rejects on their own are recorded in
+`processing_dead_letters` and do not hold the watermark back, since
+rereading them would fail the same way on every run.
+
+`collected_at` is stamped by the collector just before its upsert, so a
+row can commit after rows with later timestamps. Runs therefore only read
+rows older than `safety_lag` seconds: a late commit still lands ahead of
+the watermark as long as it takes less than the lag. The keyset filter
+itself is unchanged, so rereading a page stays idempotent.
+
+Author: [Your Name]
+Date: 2024
+"""
+
+import asyncio
+import logging
+import os
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+from data_processor import DataProcessor
+from metrics import RunProfiler
+
+logger = logging.getLogger(__name__)
+
+# (collected_at, record_id) of the last processed row
+Watermark = Tuple[str, str]
+
+
+def _quote(value: str) -> str:
+    """Quote a value for a PostgREST logical filter (commas, dots, '+' ...)."""
+    return '"' + str(value).replace('\\', '\\\\').replace('"', '\\"') + '"'
+
+
+class IncrementalProcessor:
+    """
+    Process newly collected rows since the last run.
+
+    Usage:
+        runner = IncrementalProcessor(DataProcessor(), source_id='ealing')
+        stats = await runner.run()
+    """
+
+    def __init__(self,
+                 processor: DataProcessor,
+                 source_id: Optional[str] = None,
+                 pipeline_id: Optional[str] = None,
+                 page_size: int = 500,
+                 safety_lag: float = 300.0):
+        """
+        Initialize the runner.
+
+        Args:
+            processor: Data processor with a database connection
+            source_id: Only process rows of this source; None for all
+            pipeline_id: Watermark name; defaults to the source id or 'all'
+            page_size: Rows read, processed and saved per page
+            safety_lag: Seconds a row must have been collected before it is
+                read; must exceed the longest collector commit delay
+        """
+        self.processor = processor
+        self.supabase = processor.supabase
+        self.source_id = source_id
+        self.pipeline_id = pipeline_id or source_id or 'all'
+        self.page_size = page_size
+        self.safety_lag = safety_lag
+
+    def load_watermark(self) -> Optional[Watermark]:
+        """Read the stored watermark; None before the first run."""
+        response = self.supabase.table("processing_metadata").select(
+            "last_collected_at, last_record_id"
+        ).eq("pipeline_id", self.pipeline_id).limit(1).execute()
+
+        if not response.data or not response.data[0].get('last_collected_at'):
+            return None
+        row = response.data[0]
+        return row['last_collected_at'], row['last_record_id']
+
+    def save_watermark(self, watermark: Watermark):
+        """Store the watermark; one upsert, so both columns move together."""
+        collected_at, record_id = watermark
+        self.supabase.table("processing_metadata").upsert({
+            'pipeline_id': self.pipeline_id,
+            'last_collected_at': collected_at,
+            'last_record_id': record_id,
+            'updated_at': datetime.now(timezone.utc).isoformat()
+        }, on_conflict='pipeline_id').execute()
+
+    def reset_watermark(self):
+        """Forget the watermark so the next run reprocesses everything."""
+        self.supabase.table("processing_metadata").delete().eq(
+            "pipeline_id", self.pipeline_id
+        ).execute()
+
+    def save_dead_letters(self, rejected: Dict[str, str]):
+        """Record rows the database rejected, so the watermark can move past them."""
+        failed_at = datetime.now(timezone.utc).isoformat()
+        self.supabase.table("processing_dead_letters").upsert([
+            {
+                'pipeline_id': self.pipeline_id,
+                'record_id': record_id,
+                'error': error,
+                'failed_at': failed_at
+            }
+            for record_id, error in rejected.items()
+        ], on_conflict='pipeline_id,record_id').execute()
+
+    def _fetch_page(self, after: Optional[Watermark], until: str) -> List[Dict[str, Any]]:
+        """Read the next page of rows strictly after the watermark and collected before `until`."""
+        query = self.supabase.table("collected_data").select(
+            "record_id, title, description, url, source_id, collected_at"
+        )
+        query = query.lt("collected_at", until)
+        if self.source_id:
+            query = query.eq("source_id", self.source_id)
+        if after:
+            collected_at, record_id = after
+            query = query.or_(
+                f"collected_at.gt.{_quote(collected_at)},"
+                f"and(collected_at.eq.{_quote(collected_at)},record_id.gt.{_quote(record_id)})"
+            )
+
+        response = query.order("collected_at").order("record_id").limit(self.page_size).execute()
+        return response.data or []
+
+    @staticmethod
+    def _to_record(row: Dict[str, Any]) -> Dict[str, Any]:
+        """Map a collected_data row to the processor's input format."""
+        record = dict(row)
+        record['id'] = record.pop('record_id')
+        return record
+
+    async def run(self, max_pages: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Process every row collected since the watermark.
+
+        Args:
+            max_pages: Stop after this many pages; None to drain
+
+        Returns:
+            Run statistics, including the final watermark
+        """
+        start_time = datetime.now(timezone.utc)
+        loop = asyncio.get_running_loop()
+        stats = {
+            'pages': 0,
+            'read': 0,
+            'processed': 0,
+            'saved': 0,
+            'dead_lettered': 0,
+            'errors': [],
+            'completed': False
+        }
+
+        self.processor.metrics.reset()
+        profiler = RunProfiler(
+            self.processor.profile_modes,
+            os.path.join(self.processor.profile_dir, f"incremental_{self.pipeline_id}")
+        )
+
+        try:
+            with profiler:
+                watermark = await loop.run_in_executor(None, self.load_watermark)
+                # Fixed for the run, so the cutoff does not creep forward while paging
+                until = (start_time - timedelta(seconds=self.safety_lag)).isoformat()
+                logger.info(f"Incremental processing for '{self.pipeline_id}' from watermark {watermark}, "
+                            f"rows collected before {until}")
+
+                while max_pages is None or stats['pages'] < max_pages:
+                    rows = await loop.run_in_executor(None, self._fetch_page, watermark, until)
+                    if not rows:
+                        stats['completed'] = True
+                        break
+
+                    results = await self.processor.process_data_batch([self._to_record(row) for row in rows])
+                    save_result = await self.processor.save_processed_data(results)
+
+                    stats['pages'] += 1
+                    stats['read'] += len(rows)
+                    stats['processed'] += sum(1 for r in results if r.success)
+                    stats['saved'] += save_result['saved_count']
+
+                    stats['errors'].extend(save_result['errors'])
+                    rejected = save_result.get('rejected', {})
+                    if len(save_result['failed_record_ids']) > len(rejected):
+                        # Connection or timeout failure: keep the watermark so
+                        # the page is read again next run
+                        logger.error(f"Saving page {stats['pages']} failed; watermark stays at {watermark}")
+                        break
+
+                    if rejected:
+                        # Isolated bad rows would fail the same way on every
+                        # rerun; park them instead of stalling the pipeline
+                        try:
+                            await loop.run_in_executor(None, self.save_dead_letters, rejected)
+                        except Exception as e:
+                            stats['errors'].append(f"dead letters: {e}")
+                            logger.error(f"Recording {len(rejected)} rejected rows failed ({e}); "
+                                         f"watermark stays at {watermark}")
+                            break
+                        stats['dead_lettered'] += len(rejected)
+                        logger.warning(f"Page {stats['pages']}: {len(rejected)} rows rejected and "
+                                       f"dead-lettered: {sorted(rejected)}")
+
+                    last = rows[-1]
+                    watermark = (last['collected_at'], last['record_id'])
+                    await loop.run_in_executor(None, self.save_watermark, watermark)
+
+                    logger.info(f"Page {stats['pages']}: {len(rows)} rows read, "
+                                f"{save_result['saved_count']} saved; watermark {watermark}")
+
+                    if len(rows) < self.page_size:
+                        stats['completed'] = True
+                        break
+        finally:
+            self.processor.metrics.export(self.processor.metrics_path)
+
+        stats['watermark'] = watermark
+        stats['duration'] = (datetime.now(timezone.utc) - start_time).total_seconds()
+        logger.info(f"Incremental processing finished: {stats['read']} rows read, "
+                    f"{stats['saved']} saved in {stats['duration']:.2f}s")
+        return stats
+
+
+# Example usage
+async def main():
+    """Example usage of the incremental runner."""
+    processor = DataProcessor()
+    runner = IncrementalProcessor(processor, source_id="example_source")
+
+    try:
+        stats = await runner.run()
+    finally:
+        processor.close()
+
+    print(f"Incremental run completed. {stats['saved']} records saved.")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
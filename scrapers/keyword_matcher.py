@@ -0,0 +1,117 @@
+"""
+DataFlow Pro - Multi-Pattern Keyword Matcher
+
+Aho-Corasick automaton over word tokens. All keyword groups (categories,
+tags, spam indicators, ...) are compiled once into a single automaton and
+a text is matched against every keyword in one pass, so the cost depends
+on the length of the text and not on the number of keywords.
+
+Matching works on whole word tokens, which gives word-boundary semantics
+for free: "ai" matches "AI startup" but not "said", and multi-word phrases
+such as "click here" are matched token by token.
+
+Author: [Your Name]
+Date: 2024
+"""
+
+import re
+from collections import deque
+from typing import Dict, Iterable, List, Mapping, Set, Tuple
+
+TOKEN_PATTERN = re.compile(r'\w+')
+
+
+class KeywordMatcher:
+    """
+    Compiled matcher for named groups of keywords.
+
+    Usage:
+        matcher = KeywordMatcher({'tag': ['saas', 'ai'], 'spam': ['click here']})
+        found = matcher.match(matcher.tokenize("Click here for our AI SaaS"))
+        matcher.by_group(found)  # {'tag': {'ai', 'saas'}, 'spam': {'click here'}}
+    """
+
+    def __init__(self, groups: Mapping[str, Iterable[str]]):
+        """
+        Build the automaton.
+
+        Args:
+            groups: Group name -> keywords; a keyword may be in several groups
+        """
+        self.keyword_groups: Dict[str, Tuple[str, ...]] = {}
+        for group, keywords in groups.items():
+            for keyword in keywords:
+                keyword = keyword.lower()
+                if group not in self.keyword_groups.get(keyword, ()):
+                    self.keyword_groups[keyword] = self.keyword_groups.get(keyword, ()) + (group,)
+
+        # State 0 is the root. _goto[state][token] -> next state,
+        # _fail[state] -> longest proper suffix state, _out[state] -> keywords
+        # ending in this state (including those inherited via fail links).
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[Tuple[str, ...]] = [()]
+
+        for keyword in self.keyword_groups:
+            tokens = self.tokenize(keyword)
+            if not tokens:
+                continue
+            state = 0
+            for token in tokens:
+                next_state = self._goto[state].get(token)
+                if next_state is None:
+                    next_state = len(self._goto)
+                    self._goto[state][token] = next_state
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._out.append(())
+                state = next_state
+            self._out[state] += (keyword,)
+
+        self._build_fail_links()
+
+    def _build_fail_links(self):
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for token, child in self._goto[state].items():
+                queue.append(child)
+                fail = self._fail[state]
+                while fail and token not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[child] = self._goto[fail].get(token, 0)
+                self._out[child] += self._out[self._fail[child]]
+
+    @staticmethod
+    def tokenize(text: str) -> List[str]:
+        """Lowercase word tokens of a text."""
+        return TOKEN_PATTERN.findall(text.lower()) if text else []
+
+    def match(self, tokens: List[str]) -> Dict[str, int]:
+        """
+        Find every keyword in a token sequence.
+
+        Returns:
+            Keyword -> index of the token where its first occurrence ends
+        """
+        goto, fail, out = self._goto, self._fail, self._out
+        found: Dict[str, int] = {}
+        state = 0
+
+        for index, token in enumerate(tokens):
+            while state and token not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(token, 0)
+            for keyword in out[state]:
+                if keyword not in found:
+                    found[keyword] = index
+
+        return found
+
+    def by_group(self, keywords: Iterable[str]) -> Dict[str, Set[str]]:
+        """Group matched keywords by the groups they belong to."""
+        grouped: Dict[str, Set[str]] = {}
+        for keyword in keywords:
+            for group in self.keyword_groups[keyword]:
+                grouped.setdefault(group, set()).add(keyword)
+        return grouped
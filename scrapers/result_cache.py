@@ -0,0 +1,120 @@
+"""
+DataFlow Pro - Processing Result Cache
+
+Memoises the content-derived part of DataProcessor output: cleaned text,
+content hash and stats, category, tags and keyword hits. Entries are keyed
+by a hash of the raw title and description together with the processing
+rules version, so a rules change simply stops old entries from matching.
+
+Lookups go to an in-memory LRU first and fall back to a local SQLite
+store, which keeps entries across runs.
+
+Author: [Your Name]
+Date: 2024
+"""
+
+import json
+import logging
+import sqlite3
+from collections import OrderedDict
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Tuple
+
+from sqlite_store import SQLiteStore
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS processing_results (
+    cache_key TEXT PRIMARY KEY,
+    entry TEXT NOT NULL,
+    updated_at TEXT NOT NULL
+);
+"""
+
+# SQLite limits the number of bound parameters per statement
+LOOKUP_CHUNK_SIZE = 500
+
+
+class ResultCache(SQLiteStore):
+    """Two-level (memory LRU + SQLite) store of processing results."""
+
+    def __init__(self, path: str, max_memory_entries: int = 10000):
+        """
+        Open (or create) the cache.
+
+        Args:
+            path: SQLite database file
+            max_memory_entries: Entries kept in the in-memory LRU
+        """
+        super().__init__(path, SCHEMA)
+        self.max_memory_entries = max_memory_entries
+        self._memory: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self.stats = {'memory_hits': 0, 'disk_hits': 0, 'misses': 0}
+
+    def _remember(self, key: str, entry: Dict[str, Any]):
+        self._memory[key] = entry
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_memory_entries:
+            self._memory.popitem(last=False)
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Look up several keys at once.
+
+        Returns:
+            Key -> entry for the keys that are cached
+        """
+        found: Dict[str, Dict[str, Any]] = {}
+        missing: List[str] = []
+
+        with self._lock:
+            for key in keys:
+                if key in found:
+                    continue
+                entry = self._memory.get(key)
+                if entry is None:
+                    missing.append(key)
+                else:
+                    self._memory.move_to_end(key)
+                    found[key] = entry
+            self.stats['memory_hits'] += len(found)
+
+            missing = list(dict.fromkeys(missing))
+            for i in range(0, len(missing), LOOKUP_CHUNK_SIZE):
+                chunk = missing[i:i + LOOKUP_CHUNK_SIZE]
+                placeholders = ','.join('?' * len(chunk))
+                rows = self._conn.execute(
+                    f"SELECT cache_key, entry FROM processing_results WHERE cache_key IN ({placeholders})",
+                    chunk
+                ).fetchall()
+                for key, entry in rows:
+                    found[key] = json.loads(entry)
+                    self._remember(key, found[key])
+                self.stats['disk_hits'] += len(rows)
+                self.stats['misses'] += len(chunk) - len(rows)
+
+        return found
+
+    def put_many(self, entries: Iterable[Tuple[str, Dict[str, Any]]]):
+        """Store (key, entry) pairs in memory and on disk in one transaction."""
+        now = datetime.now(timezone.utc).isoformat()
+        rows = []
+        with self._lock:
+            for key, entry in entries:
+                self._remember(key, entry)
+                rows.append((key, json.dumps(entry), now))
+            if not rows:
+                return
+            try:
+                self._conn.executemany(
+                    "INSERT INTO processing_results (cache_key, entry, updated_at) VALUES (?, ?, ?) "
+                    "ON CONFLICT (cache_key) DO UPDATE SET entry = excluded.entry, "
+                    "updated_at = excluded.updated_at",
+                    rows
+                )
+                self._conn.commit()
+            except sqlite3.Error as e:
+                # The cache is an optimisation; a failed write only costs a recompute later
+                logger.warning(f"Failed to persist {len(rows)} cache entries: {e}")
+                self._conn.rollback()
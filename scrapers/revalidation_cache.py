@@ -0,0 +1,92 @@
+"""
+DataFlow Pro - HTTP Revalidation Cache
+
+On-disk cache of HTTP validators per URL. Repeat crawls send
+If-None-Match / If-Modified-Since built from the stored ETag and
+Last-Modified values; a 304 answer means the page, and therefore the
+record extracted from it, is unchanged and needs no extraction or
+database work. The last content hash is kept as well so a 200 response
+with identical content can be skipped the same way.
+
+Author: [Your Name]
+Date: 2024
+"""
+
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Dict, Iterable, Optional, Tuple
+
+from sqlite_store import SQLiteStore
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS http_validators (
+    url TEXT PRIMARY KEY,
+    etag TEXT,
+    last_modified TEXT,
+    content_hash TEXT,
+    updated_at TEXT NOT NULL
+);
+"""
+
+
+@dataclass
+class CacheEntry:
+    """Validators stored for one URL."""
+    url: str
+    etag: Optional[str]
+    last_modified: Optional[str]
+    content_hash: Optional[str]
+
+
+class RevalidationCache(SQLiteStore):
+    """SQLite-backed store of ETag, Last-Modified and content hash per URL."""
+
+    def __init__(self, path: str):
+        """
+        Open (or create) the cache.
+
+        Args:
+            path: SQLite database file
+        """
+        super().__init__(path, SCHEMA)
+
+    def get(self, url: str) -> Optional[CacheEntry]:
+        """Return the stored validators for a URL, if any."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT url, etag, last_modified, content_hash FROM http_validators WHERE url = ?",
+                (url,)
+            ).fetchone()
+        return CacheEntry(*row) if row else None
+
+    @staticmethod
+    def conditional_headers(entry: Optional[CacheEntry]) -> Dict[str, str]:
+        """Build conditional request headers from a cache entry."""
+        headers = {}
+        if entry is None:
+            return headers
+        if entry.etag:
+            headers['If-None-Match'] = entry.etag
+        if entry.last_modified:
+            headers['If-Modified-Since'] = entry.last_modified
+        return headers
+
+    def store_many(self, entries: Iterable[Tuple[str, Optional[str], Optional[str], Optional[str]]]):
+        """
+        Store validators for several URLs in one transaction.
+
+        Args:
+            entries: (url, etag, last_modified, content_hash) tuples
+        """
+        now = datetime.now(timezone.utc).isoformat()
+        with self._lock:
+            self._conn.executemany(
+                "INSERT INTO http_validators (url, etag, last_modified, content_hash, updated_at) "
+                "VALUES (?, ?, ?, ?, ?) "
+                "ON CONFLICT (url) DO UPDATE SET etag = excluded.etag, "
+                "last_modified = excluded.last_modified, content_hash = excluded.content_hash, "
+                "updated_at = excluded.updated_at",
+                ((url, etag, last_modified, content_hash, now)
+                 for url, etag, last_modified, content_hash in entries)
+            )
+            self._conn.commit()
@@ -0,0 +1,42 @@
+"""
+DataFlow Pro - Local SQLite Store
+
+Shared base for the small on-disk stores next to the pipeline: the crawl
+journal, the HTTP revalidation cache and the processing result cache.
+Each opens one connection in WAL mode, so readers never block the single
+writer and small commits stay cheap, and serialises access to it with a
+lock so the store can be used from executor threads.
+
+The stores are blocking; async callers run their methods off the event
+loop, e.g. with loop.run_in_executor.
+
+Author: [Your Name]
+Date: 2024
+"""
+
+import sqlite3
+import threading
+
+
+class SQLiteStore:
+    """Thread-safe SQLite connection with the pragmas every local store uses."""
+
+    def __init__(self, path: str, schema: str):
+        """
+        Open (or create) the database and apply its schema.
+
+        Args:
+            path: SQLite database file
+            schema: CREATE ... IF NOT EXISTS statements for the store's tables
+        """
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(schema)
+        self._conn.commit()
+
+    def close(self):
+        """Close the database connection."""
+        self._conn.close()
@@ -0,0 +1,169 @@
+"""
+DataFlow Pro - Write-Behind Queue
+
+Async front end for blocking database writers. Producers enqueue records
+and carry on crawling while a single background task batches them and runs
+the (synchronous) writer in a thread pool, so supabase-py's blocking
+`.execute()` never stalls the event loop.
+
+- Size- and time-based flushing: a batch is written once it reaches
+  `batch_size` items or `flush_interval` seconds after its first item
+- Backpressure: the queue is bounded, so `put` waits when the writer falls
+  behind and producers slow down instead of buffering without limit
+- Shutdown: `close` flushes everything still queued, or drops it when
+  `flush_on_close` is disabled
+
+Author: [Your Name]
+Date: 2024
+"""
+
+import asyncio
+import logging
+from concurrent.futures import Executor
+from typing import Any, Callable, Generic, List, Optional, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar('T')
+
+_CLOSE = object()
+
+
+class WriteBehindQueue(Generic[T]):
+    """
+    Bounded queue that writes items in batches on an executor.
+
+    The writer receives a list of items and may return the number of items
+    it persisted, in which case the rest of the batch counts as failed; any
+    other return value counts the whole batch as written.
+
+    Usage:
+        async with WriteBehindQueue(write_rows, batch_size=100) as queue:
+            await queue.put(row)
+    """
+
+    def __init__(self,
+                 writer: Callable[[List[T]], Any],
+                 batch_size: int = 100,
+                 flush_interval: float = 2.0,
+                 max_queue_size: int = 1000,
+                 flush_on_close: bool = True,
+                 executor: Optional[Executor] = None,
+                 name: str = "write-behind"):
+        """
+        Initialize the queue.
+
+        Args:
+            writer: Blocking callable that persists a batch of items
+            batch_size: Flush once this many items are buffered
+            flush_interval: Flush a partial batch after this many seconds
+            max_queue_size: Items held before producers are made to wait
+            flush_on_close: Write remaining items on close instead of
+                dropping them
+            executor: Executor for the writer; defaults to the loop's
+            name: Label used in log messages
+        """
+        self.writer = writer
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.flush_on_close = flush_on_close
+        self.executor = executor
+        self.name = name
+
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=max_queue_size)
+        self._task: Optional[asyncio.Task] = None
+        self._batch: List[T] = []
+        self._closing = False
+        self.stats = {
+            'enqueued': 0,
+            'written': 0,
+            'batches': 0,
+            'failed_batches': 0,
+            'failed_items': 0,
+            'dropped': 0,
+            'producer_waits': 0
+        }
+
+    async def __aenter__(self) -> "WriteBehindQueue[T]":
+        self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+
+    def start(self):
+        """Start the background flush task."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def put(self, item: T):
+        """Enqueue an item, waiting while the queue is full."""
+        if self._closing:
+            raise RuntimeError(f"{self.name} queue is closed")
+        if self._queue.full():
+            self.stats['producer_waits'] += 1
+        await self._queue.put(item)
+        self.stats['enqueued'] += 1
+
+    async def close(self):
+        """Stop accepting items and flush or drop whatever is queued."""
+        if self._task is None or self._closing:
+            return
+        self._closing = True
+
+        if self.flush_on_close:
+            await self._queue.put(_CLOSE)
+            await self._task
+        else:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self.stats['dropped'] += len(self._batch)
+            self._batch = []
+            while not self._queue.empty():
+                if self._queue.get_nowait() is not _CLOSE:
+                    self.stats['dropped'] += 1
+
+        logger.info(f"{self.name} closed: {self.stats}")
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        deadline = None
+
+        while True:
+            timeout = None if deadline is None else max(0.0, deadline - loop.time())
+            try:
+                item = await asyncio.wait_for(self._queue.get(), timeout)
+            except asyncio.TimeoutError:
+                pass
+            else:
+                if item is _CLOSE:
+                    await self._flush()
+                    return
+                self._batch.append(item)
+                if deadline is None:
+                    deadline = loop.time() + self.flush_interval
+
+            if len(self._batch) >= self.batch_size or (deadline is not None and loop.time() >= deadline):
+                await self._flush()
+                deadline = None
+
+    async def _flush(self):
+        batch, self._batch = self._batch, []
+        if not batch:
+            return
+        loop = asyncio.get_running_loop()
+        try:
+            result = await loop.run_in_executor(self.executor, self.writer, batch)
+            self.stats['batches'] += 1
+            written = result if isinstance(result, int) else len(batch)
+            self.stats['written'] += written
+            if written < len(batch):
+                self.stats['failed_items'] += len(batch) - written
+                logger.error(f"{self.name} wrote {written} of a batch of {len(batch)}")
+        except Exception as e:
+            self.stats['failed_batches'] += 1
+            self.stats['failed_items'] += len(batch)
+            logger.error(f"{self.name} failed to write batch of {len(batch)}: {e}")
@@ -14,12 +14,18 @@ import hashlib
 from dotenv import load_dotenv
 import os
 import json
+from pathlib import Path
 from typing import Dict, List, Optional, Tuple
 import time
 
 # Import Supabase Client
 from supabase import create_client, Client
 
+# Shared crawler components live in the top-level scrapers/ directory
+sys.path.append(str(Path(__file__).resolve().parents[2] / 'scrapers'))
+from resource_filter import ResourceFilter
+from write_behind import WriteBehindQueue
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -51,6 +57,8 @@ MAX_RETRIES = 3
 RETRY_DELAY = 5  # seconds
 PAGE_TIMEOUT = 30000  # milliseconds
 BATCH_SIZE = 10  # Process applications in batches
+WRITE_QUEUE_SIZE = 100  # Scraped applications buffered before scraping waits on the database
+WRITE_FLUSH_INTERVAL = 2  # seconds
 
 class EalingScraper:
     def __init__(self):
@@ -101,13 +109,24 @@ class EalingScraper:
         except Exception as e:
             logger.error(f"Error updating scrape date: {e}")
 
-    async def get_application_data_from_db(self, reference: str) -> dict | None:
-        """Fetches an application record from Supabase by reference number."""
+    def _fetch_application(self, reference: str) -> dict | None:
         response = supabase.table("applications").select("*").eq("reference", reference).limit(1).execute()
         return response.data[0] if response.data else None
 
+    async def get_application_data_from_db(self, reference: str) -> dict | None:
+        """Fetches an application record from Supabase by reference number."""
+        return await asyncio.get_running_loop().run_in_executor(None, self._fetch_application, reference)
+
     async def save_application_to_db(self, data: Dict) -> bool:
-        """Save application to database."""
+        """Save application to database without blocking the event loop."""
+        return await asyncio.get_running_loop().run_in_executor(None, self._write_application, data)
+
+    def _write_applications(self, batch: List[Dict]) -> int:
+        """Write-behind flush: save a batch of applications, returning how many succeeded."""
+        return sum(1 for data in batch if self._write_application(data))
+
+    def _write_application(self, data: Dict) -> bool:
+        """Save application to database. Blocking; run it off the event loop."""
         try:
             app_reference = data.get('Reference')
             if not app_reference:
@@ -132,22 +151,27 @@ class EalingScraper:
             }
             
             # Check if application already exists by reference
-            existing_app = await self.get_application_data_from_db(app_reference)
+            existing_app = self._fetch_application(app_reference)
 
             if existing_app:
                 # Compare content hash to detect changes
                 if existing_app.get('content_hash') != supabase_data.get('content_hash'):
                     logger.info(f"Updating existing application: {app_reference}")
                     response = supabase.table("applications").update(supabase_data).eq("reference", app_reference).execute()
+                    outcome = 'updated_applications'
                 else:
                     # Content hash matches, only update last_scraped_at
                     logger.info(f"Application {app_reference} unchanged, updating last_scraped_at")
                     response = supabase.table("applications").update({'last_scraped_at': now_utc_iso}).eq("reference", app_reference).execute()
+                    outcome = None
             else:
                 logger.info(f"Inserting new application: {app_reference}")
                 response = supabase.table("applications").insert([supabase_data]).execute()
+                outcome = 'new_applications'
 
             if response.data:
+                if outcome:
+                    self.stats[outcome] += 1
                 return True
             else:
                 logger.error(f"Failed to save application {app_reference}")
@@ -295,11 +319,24 @@ class EalingScraper:
             browser = await p.chromium.launch(headless=True)
             page = await browser.new_page()
             
+            # Skip images, fonts, stylesheets and analytics; only the HTML is scraped
+            await ResourceFilter.for_source(COUNCIL_ID).install(page)
+            
             # Set user agent to avoid detection
             await page.set_extra_http_headers({
                 'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
             })
 
+            # Saves are queued and written on a worker thread while scraping continues
+            writer = WriteBehindQueue(
+                self._write_applications,
+                batch_size=BATCH_SIZE,
+                flush_interval=WRITE_FLUSH_INTERVAL,
+                max_queue_size=WRITE_QUEUE_SIZE,
+                name="applications writer"
+            )
+            writer.start()
+
             try:
                 last_scrape_dt = await self.get_last_successful_scrape_date()
                 current_date_utc = datetime.now(timezone.utc)
@@ -338,7 +375,7 @@ class EalingScraper:
                             data = await self.scrape_application_details(page, url)
                             
                             if data:
-                                await self.save_application_to_db(data)
+                                await writer.put(data)
                                 self.stats['total_processed'] += 1
                             else:
                                 self.stats['errors'] += 1
@@ -353,6 +390,7 @@ class EalingScraper:
                         await asyncio.sleep(5)
 
             finally:
+                await writer.close()
                 await browser.close()
 
             # Update last successful scrape date
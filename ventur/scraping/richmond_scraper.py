@@ -9,13 +9,25 @@ import sys
 import json
 import hashlib
 import logging
+import re
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Any
+from zoneinfo import ZoneInfo
+from typing import AsyncIterator, Dict, List, Optional, Any, Tuple
 import asyncio
-from playwright.async_api import async_playwright, Browser, Page
+from pathlib import Path
+from lxml import html as lxml_html
+from lxml.cssselect import CSSSelector
+from playwright.async_api import async_playwright, Browser, BrowserContext, Page, Response
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError
 from supabase import create_client, Client
 from dotenv import load_dotenv
 
+# Shared crawler components live in the top-level scrapers/ directory
+sys.path.append(str(Path(__file__).resolve().parents[2] / 'scrapers'))
+from rate_limiter import HostRateLimiter
+from resource_filter import ResourceFilter
+from write_behind import WriteBehindQueue
+
 # Load environment variables
 load_dotenv()
 
@@ -30,6 +42,202 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Council dates are London calendar dates
+LOCAL_TIMEZONE = ZoneInfo('Europe/London')
+
+# Application detail fields: CSS selector, where the value lives ('text'
+# for the element's text content, otherwise an attribute name) and an
+# optional parser for the stripped value. Used both in the live page and
+# against saved HTML, so the two always agree.
+FIELD_MAP: Dict[str, Dict[str, str]] = {
+    'reference': {'selector': 'input[sas-id="reference"]', 'source': 'value'},
+    'address': {'selector': 'textarea[sas-id="location"]', 'source': 'text'},
+    'proposal': {'selector': 'textarea[sas-id="fullProposal"]', 'source': 'text'},
+    'status': {'selector': 'input[sas-id="statusNonOwner"]', 'source': 'value'},
+    'decision': {'selector': 'span.stat-desc-span', 'source': 'text'},
+    'decision_issued_date': {'selector': 'input[sas-id="dispatchDate"]', 'source': 'value', 'parse': 'date'},
+    # Officer name stands in for the applicant, which the page does not show
+    'applicant_name': {'selector': 'input[sas-id="officerName"]', 'source': 'value'},
+    'application_registered': {'selector': 'input[sas-id="receivedDate"]', 'source': 'value', 'parse': 'date'},
+    'application_validated': {'selector': 'input[sas-id="validDate"]', 'source': 'value', 'parse': 'date'},
+}
+
+# Matches once Angular has bound the application to the detail form
+POPULATED_REFERENCE_SELECTOR = 'input[sas-id="reference"][value]:not([value=""])'
+
+# Results table: reference of every row on the current results page
+RESULT_ROW_REFERENCES_JS = """
+() => Array.from(
+    document.querySelectorAll('table tbody tr.animate-repeat td:first-child'),
+    cell => (cell.textContent || '').trim()
+).filter(Boolean)
+"""
+
+# Pager controls for the next results page, tried in order
+NEXT_PAGE_SELECTORS = [
+    'li.pagination-next:not(.disabled) a',
+    'a[ng-click*="nextPage"]:not(.disabled):not([disabled])',
+    'button[ng-click*="nextPage"]:not([disabled])',
+    'a[aria-label="Next"]',
+    'li:not(.disabled) > a:has-text("Next")',
+]
+
+# Whether a pager control is disabled, however the template marks it;
+# ng-disabled sets the disabled attribute, but the li may carry the class
+PAGER_DISABLED_JS = """
+(element) => element.hasAttribute('disabled')
+    || element.classList.contains('disabled')
+    || element.getAttribute('aria-disabled') === 'true'
+    || element.closest('li.disabled') !== null
+"""
+
+# Reads every FIELD_MAP field in one page.evaluate round trip
+EXTRACT_FIELDS_JS = """
+(fields) => {
+    const values = {};
+    for (const [name, spec] of Object.entries(fields)) {
+        const element = document.querySelector(spec.selector);
+        values[name] = !element ? null
+            : spec.source === 'text' ? element.textContent
+            : element.getAttribute(spec.source);
+    }
+    return values;
+}
+"""
+
+_compiled_selectors: Dict[str, CSSSelector] = {}
+
+def extract_fields_from_html(html: str) -> Dict[str, Optional[str]]:
+    """Raw FIELD_MAP values from saved detail-page HTML, as EXTRACT_FIELDS_JS returns them"""
+    document = lxml_html.fromstring(html)
+    values = {}
+    for name, spec in FIELD_MAP.items():
+        selector = _compiled_selectors.get(spec['selector'])
+        if selector is None:
+            selector = _compiled_selectors[spec['selector']] = CSSSelector(spec['selector'])
+        matches = selector(document)
+        if not matches:
+            values[name] = None
+        elif spec['source'] == 'text':
+            values[name] = matches[0].text_content()
+        else:
+            values[name] = matches[0].get(spec['source'])
+    return values
+
+# JSON keys for each field in the portal's API payloads. The Angular
+# detail form binds its inputs to the same model names as their sas-id
+# attributes (see FIELD_MAP), so those come first.
+API_FIELD_KEYS: Dict[str, Tuple[str, ...]] = {
+    'reference': ('reference',),
+    'address': ('location', 'address'),
+    'proposal': ('fullProposal', 'proposal'),
+    'status': ('statusNonOwner', 'status'),
+    'decision': ('decisionText', 'decision', 'statusDescription'),
+    'decision_issued_date': ('dispatchDate', 'decisionDate'),
+    'applicant_name': ('officerName', 'applicantName'),
+    'application_registered': ('receivedDate', 'registrationDate'),
+    'application_validated': ('validDate', 'validationDate'),
+}
+
+def fields_from_api(record: Dict[str, Any]) -> Dict[str, Optional[str]]:
+    """Raw FIELD_MAP values from an API application record"""
+    values: Dict[str, Optional[str]] = {}
+    for name, keys in API_FIELD_KEYS.items():
+        value = next((record[key] for key in keys if record.get(key) not in (None, '')), None)
+        if isinstance(value, dict):
+            # Coded values come as {code, description}
+            value = value.get('description') or value.get('text')
+        values[name] = None if value is None or isinstance(value, (dict, list)) else str(value)
+    return values
+
+class ApiResponseCapture:
+    """
+    Collects the portal's JSON API responses from a page via page.on('response').
+    
+    Search responses carry lists of application rows; a detail response
+    is a single application object. Rows and detail records are kept until
+    taken, so a response that arrives before anyone waits for it is not
+    lost. Taking a detail drops any others, so late responses for earlier
+    references do not pile up.
+    """
+
+    def __init__(self, url_pattern: re.Pattern):
+        self.url_pattern = url_pattern
+        self.search_rows: List[Dict[str, Any]] = []
+        # Result count the search API reports, when it does
+        self.search_total: Optional[int] = None
+        self.details: Dict[str, Dict[str, Any]] = {}
+        self._changed = asyncio.Event()
+
+    def attach(self, page: Page):
+        page.on('response', self._on_response)
+
+    async def _on_response(self, response: Response):
+        if not response.ok or not self.url_pattern.search(response.url):
+            return
+        if 'json' not in response.headers.get('content-type', ''):
+            return
+        try:
+            payload = await response.json()
+        except Exception as e:
+            logger.debug(f"Unreadable API response {response.url}: {e}")
+            return
+        
+        if isinstance(payload, dict) and payload.get('reference'):
+            self.details[str(payload['reference']).strip()] = payload
+        else:
+            self.search_rows.extend(self._application_rows(payload))
+            if isinstance(payload, dict):
+                total = next((payload[key] for key in ('total', 'totalCount', 'totalResults')
+                              if isinstance(payload.get(key), int)), None)
+                if total is not None:
+                    self.search_total = total
+        self._changed.set()
+
+    @classmethod
+    def _application_rows(cls, payload: Any) -> List[Dict[str, Any]]:
+        """Application rows anywhere in a search payload (results, data, items ...)"""
+        if isinstance(payload, list):
+            if payload and all(isinstance(row, dict) and row.get('reference') for row in payload):
+                return payload
+            return [row for item in payload for row in cls._application_rows(item)]
+        if isinstance(payload, dict):
+            return [row for value in payload.values() for row in cls._application_rows(value)]
+        return []
+
+    async def _wait(self, ready, timeout: float) -> bool:
+        """Wait until ready() is true or the timeout passes"""
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        while not ready():
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                return False
+            self._changed.clear()
+            try:
+                await asyncio.wait_for(self._changed.wait(), remaining)
+            except asyncio.TimeoutError:
+                return ready()
+        return True
+
+    async def take_search_rows(self, timeout: float) -> List[Dict[str, Any]]:
+        """Search rows captured since the last call, waiting up to timeout for any"""
+        await self._wait(lambda: bool(self.search_rows), timeout)
+        rows, self.search_rows = self.search_rows, []
+        return rows
+
+    async def take_detail(self, reference: str, timeout: float) -> Optional[Dict[str, Any]]:
+        """
+        The detail record for a reference, waiting up to timeout for it.
+        
+        Every other detail held is dropped: the page has moved on, so they
+        are late responses for earlier references nobody will ask for again.
+        """
+        await self._wait(lambda: reference in self.details, timeout)
+        record = self.details.pop(reference, None)
+        self.details.clear()
+        return record
+
 class RichmondScraper:
     def __init__(self):
         self.supabase_url = os.getenv('SUPABASE_URL')
@@ -49,6 +257,30 @@ class RichmondScraper:
         self.start_date = week_ago.strftime("%d/%m/%Y")
         self.end_date = today.strftime("%d/%m/%Y")
         
+        # Write-behind settings for streaming saves
+        self.save_batch_size = 25
+        self.save_flush_interval = 2.0
+        self.save_queue_size = 100
+        
+        # Network capture: application data is read from the portal's JSON
+        # API responses; the rendered DOM is only scraped when no matching
+        # response arrives within api_response_timeout seconds
+        self.capture_api = True
+        self.api_url_pattern = re.compile(os.getenv('RICHMOND_API_PATTERN', r'/api/'), re.IGNORECASE)
+        self.api_response_timeout = 10.0
+        self.extraction_counts = {'api': 0, 'dom': 0}
+        
+        # Detail pages are extracted by detail_workers pages sharing one
+        # browser context (and its cookies), paced per host by a token
+        # bucket instead of fixed sleeps
+        self.detail_workers = 4
+        self.host_rate_limit = 2.0
+        self.host_burst = 2
+        
+        # Upper bound on results pages walked, against a pager that never ends
+        self.max_result_pages = 500
+        self.search_stats: Dict[str, Any] = {'result_pages': 0}
+        
         logger.info(f"Scraping Richmond applications from {self.start_date} to {self.end_date}")
 
     async def setup_browser(self) -> Browser:
@@ -211,7 +443,9 @@ class RichmondScraper:
                     await page.wait_for_selector(selector, timeout=5000)
                     logger.info("Clicking search button...")
                     await page.click(selector)
-                    await page.wait_for_timeout(5000)
+                    if not self.capture_api:
+                        # With capture on, link extraction waits for the search response instead
+                        await page.wait_for_timeout(5000)
                     search_clicked = True
                     break
                 except Exception as e:
@@ -227,161 +461,147 @@ class RichmondScraper:
             logger.error(f"Error navigating to search page: {e}")
             return False
 
-    async def extract_application_links(self, page: Page) -> List[str]:
-        """Extract application detail page links from the results table"""
-        try:
-            logger.info("Extracting application links...")
-            
-            # Wait for results table to load
-            await page.wait_for_selector('table tbody tr', timeout=15000)
-            await page.wait_for_timeout(3000)
-            
-            # Get all application rows
-            rows = await page.query_selector_all('table tbody tr.animate-repeat')
-            logger.info(f"Found {len(rows)} application rows")
-            
-            application_links = []
-            
-            for row in rows:
-                try:
-                    # Extract the reference number from the row
-                    reference_element = await row.query_selector('td:first-child')
-                    if reference_element:
-                        reference_text = await reference_element.text_content()
-                        reference = reference_text.strip() if reference_text else None
-                        
-                        if reference:
-                            # Construct the detail page URL
-                            detail_url = f"{self.base_url}/richmond/application-details/{reference}"
-                            application_links.append(detail_url)
-                            logger.info(f"Found application: {reference}")
-                            
-                except Exception as e:
-                    logger.warning(f"Error extracting link from row: {e}")
+    def detail_url(self, reference: str) -> str:
+        """Detail page URL for an application reference"""
+        return f"{self.base_url}/richmond/application-details/{reference}"
+
+    async def extract_application_links(self, page: Page,
+                                        capture: Optional[ApiResponseCapture] = None) -> List[str]:
+        """Detail page links for every application in the result set"""
+        return [self.detail_url(reference)
+                async for reference in self.iter_application_references(page, capture)]
+
+    async def iter_application_references(self, page: Page,
+                                          capture: Optional[ApiResponseCapture] = None) -> AsyncIterator[str]:
+        """
+        Yield application references page by page through the whole result set.
+        
+        References come from the captured search API responses, or from the
+        results table for any page whose response was not captured; when the
+        first page has none, the table is used throughout. After each results
+        page the pager is advanced until it has no next page, a page brings no
+        new references, or max_result_pages is reached.
+        """
+        seen = set()
+        use_api = capture is not None
+        
+        for page_number in range(1, self.max_result_pages + 1):
+            references: List[str] = []
+            if use_api:
+                rows = await capture.take_search_rows(self.api_response_timeout)
+                references = [str(row['reference']).strip() for row in rows]
+                if not references and capture.search_total == 0:
+                    logger.info("Search returned no applications")
+                    break
+                if not references and page_number == 1:
+                    logger.warning("No search API response captured; reading the results table")
+                    use_api = False
+                elif not references:
+                    logger.warning(f"No search API response for results page {page_number}; "
+                                   f"reading the results table")
+                    references = await page.evaluate(RESULT_ROW_REFERENCES_JS)
+            if not use_api:
+                if page_number == 1:
+                    # Wait for results table to load; a search with no
+                    # matches never renders a row
+                    try:
+                        await page.wait_for_selector('table tbody tr.animate-repeat', timeout=15000)
+                    except PlaywrightTimeoutError:
+                        logger.info("No results table rows; search returned no applications")
+                        break
+                references = await page.evaluate(RESULT_ROW_REFERENCES_JS)
+            
+            new_references = [reference for reference in dict.fromkeys(references) if reference not in seen]
+            if not new_references:
+                break
+            seen.update(new_references)
+            self.search_stats['result_pages'] = page_number
+            logger.info(f"Results page {page_number}: {len(new_references)} applications "
+                        f"({len(seen)} so far)")
+            for reference in new_references:
+                yield reference
+            
+            if use_api and capture.search_total is not None and len(seen) >= capture.search_total:
+                break
+            if not await self._next_results_page(page, None if use_api else references[0]):
+                break
+        else:
+            logger.warning(f"Stopped after max_result_pages={self.max_result_pages} results pages")
+        
+        if capture is not None and capture.search_total is not None and len(seen) < capture.search_total:
+            logger.warning(f"Paging ended with {len(seen)} of {capture.search_total} "
+                           f"applications reported by the search")
+
+    async def _next_results_page(self, page: Page, first_reference: Optional[str]) -> bool:
+        """
+        Click the pager's next control. Returns False on the last page.
+        
+        With first_reference given, also waits for the table to show a
+        different first row.
+        """
+        for selector in NEXT_PAGE_SELECTORS:
+            try:
+                button = await page.query_selector(selector)
+                if not button or not await button.is_visible():
                     continue
+                if await button.evaluate(PAGER_DISABLED_JS):
+                    continue
+                await button.click()
+            except Exception as e:
+                logger.warning(f"Next page selector {selector} failed: {e}")
+                continue
             
-            logger.info(f"Extracted {len(application_links)} application links")
-            return application_links
-            
-        except Exception as e:
-            logger.error(f"Error extracting application links: {e}")
-            return []
+            if first_reference is not None:
+                try:
+                    await page.wait_for_function(
+                        """(previous) => {
+                            const cell = document.querySelector('table tbody tr.animate-repeat td:first-child');
+                            return cell && cell.textContent.trim() !== previous;
+                        }""",
+                        arg=first_reference,
+                        timeout=15000
+                    )
+                except PlaywrightTimeoutError:
+                    logger.warning("Results table did not change after paging")
+            return True
+        return False
 
-    async def extract_application_details(self, page: Page, url: str) -> Optional[Dict[str, Any]]:
-        """Extract detailed information from an application detail page"""
+    async def extract_application_details(self, page: Page, url: str,
+                                          capture: Optional[ApiResponseCapture] = None) -> Optional[Dict[str, Any]]:
+        """
+        Extract detailed information from an application detail page.
+        
+        With a capture attached to the page, the application is read from
+        the detail API response as soon as it arrives; the rendered form is
+        only scraped when no such response comes.
+        """
         try:
             logger.info(f"Extracting details from: {url}")
-            await page.goto(url, wait_until='networkidle', timeout=30000)
-            await page.wait_for_timeout(3000)
+            if capture:
+                # References contain slashes (e.g. 24/1234/FUL); everything after the prefix is the reference
+                reference = url.split('/application-details/', 1)[-1]
+                await page.goto(url, wait_until='domcontentloaded', timeout=30000)
+                record = await capture.take_detail(reference, self.api_response_timeout)
+                if record:
+                    self.extraction_counts['api'] += 1
+                    application_data = self.build_application(fields_from_api(record), url)
+                    logger.info(f"Extracted application from API: {application_data['reference']}")
+                    return application_data
+                logger.warning(f"No detail API response for {reference}; scraping the page")
+            else:
+                await page.goto(url, wait_until='domcontentloaded', timeout=30000)
             
-            # Wait for the form to load
+            # Wait for the form to load, then for Angular to bind its values
             await page.wait_for_selector('form[name="detregform"]', timeout=15000)
-            
-            # Extract all the required fields
-            application_data = {
-                'reference': None,
-                'address': None,
-                'proposal': None,
-                'status': None,
-                'decision': None,
-                'decision_issued_date': None,
-                'applicant_name': None,
-                'application_registered': None,
-                'application_validated': None,
-                'url': url
-            }
-            
-            # Extract reference number
             try:
-                reference_input = await page.query_selector('input[sas-id="reference"]')
-                if reference_input:
-                    reference_value = await reference_input.get_attribute('value')
-                    application_data['reference'] = reference_value.strip() if reference_value else None
-            except Exception as e:
-                logger.warning(f"Error extracting reference: {e}")
+                await page.wait_for_selector(POPULATED_REFERENCE_SELECTOR, state='attached', timeout=5000)
+            except PlaywrightTimeoutError:
+                logger.warning(f"Reference field still empty on {url}; extracting anyway")
             
-            # Extract location (address)
-            try:
-                location_textarea = await page.query_selector('textarea[sas-id="location"]')
-                if location_textarea:
-                    location_value = await location_textarea.text_content()
-                    application_data['address'] = location_value.strip() if location_value else None
-            except Exception as e:
-                logger.warning(f"Error extracting address: {e}")
-            
-            # Extract proposal description
-            try:
-                proposal_textarea = await page.query_selector('textarea[sas-id="fullProposal"]')
-                if proposal_textarea:
-                    proposal_value = await proposal_textarea.text_content()
-                    application_data['proposal'] = proposal_value.strip() if proposal_value else None
-            except Exception as e:
-                logger.warning(f"Error extracting proposal: {e}")
-            
-            # Extract status
-            try:
-                status_input = await page.query_selector('input[sas-id="statusNonOwner"]')
-                if status_input:
-                    status_value = await status_input.get_attribute('value')
-                    application_data['status'] = status_value.strip() if status_value else None
-            except Exception as e:
-                logger.warning(f"Error extracting status: {e}")
-            
-            # Extract decision
-            try:
-                decision_span = await page.query_selector('span.stat-desc-span')
-                if decision_span:
-                    decision_value = await decision_span.text_content()
-                    application_data['decision'] = decision_value.strip() if decision_value else None
-            except Exception as e:
-                logger.warning(f"Error extracting decision: {e}")
-            
-            # Extract decision issued date
-            try:
-                dispatch_input = await page.query_selector('input[sas-id="dispatchDate"]')
-                if dispatch_input:
-                    dispatch_value = await dispatch_input.get_attribute('value')
-                    if dispatch_value:
-                        application_data['decision_issued_date'] = self.parse_date(dispatch_value.strip())
-            except Exception as e:
-                logger.warning(f"Error extracting decision issued date: {e}")
-            
-            # Extract received date (application registered)
-            try:
-                received_input = await page.query_selector('input[sas-id="receivedDate"]')
-                if received_input:
-                    received_value = await received_input.get_attribute('value')
-                    if received_value:
-                        application_data['application_registered'] = self.parse_date(received_value.strip())
-            except Exception as e:
-                logger.warning(f"Error extracting received date: {e}")
-            
-            # Extract valid date (application validated)
-            try:
-                valid_input = await page.query_selector('input[sas-id="validDate"]')
-                if valid_input:
-                    valid_value = await valid_input.get_attribute('value')
-                    if valid_value:
-                        application_data['application_validated'] = self.parse_date(valid_value.strip())
-            except Exception as e:
-                logger.warning(f"Error extracting valid date: {e}")
-            
-            # Extract applicant name (from officer name as fallback)
-            try:
-                officer_input = await page.query_selector('input[sas-id="officerName"]')
-                if officer_input:
-                    officer_value = await officer_input.get_attribute('value')
-                    application_data['applicant_name'] = officer_value.strip() if officer_value else None
-            except Exception as e:
-                logger.warning(f"Error extracting applicant name: {e}")
-            
-            # Generate content hash
-            content_str = f"{application_data['reference']}{application_data['address']}{application_data['proposal']}{application_data['status']}"
-            application_data['content_hash'] = hashlib.md5(content_str.encode()).hexdigest()
-            
-            # Add metadata
-            application_data['council_id'] = 'Richmond'
-            application_data['last_scraped_at'] = datetime.now().isoformat()
+            # Read every field in a single round trip
+            raw_fields = await page.evaluate(EXTRACT_FIELDS_JS, FIELD_MAP)
+            application_data = self.build_application(raw_fields, url)
+            self.extraction_counts['dom'] += 1
             
             logger.info(f"Extracted application: {application_data['reference']}")
             return application_data
@@ -390,6 +610,30 @@ class RichmondScraper:
             logger.error(f"Error extracting application details from {url}: {e}")
             return None
 
+    def parse_application_html(self, html: str, url: str) -> Dict[str, Any]:
+        """Extract an application from saved detail-page HTML, without a browser"""
+        return self.build_application(extract_fields_from_html(html), url)
+
+    def build_application(self, raw_fields: Dict[str, Optional[str]], url: str) -> Dict[str, Any]:
+        """Turn raw FIELD_MAP values into an application record"""
+        application_data: Dict[str, Any] = {}
+        for name, spec in FIELD_MAP.items():
+            value = (raw_fields.get(name) or '').strip() or None
+            if value and spec.get('parse') == 'date':
+                value = self.parse_date(value)
+            application_data[name] = value
+        application_data['url'] = url
+        
+        # Generate content hash
+        content_str = f"{application_data['reference']}{application_data['address']}{application_data['proposal']}{application_data['status']}"
+        application_data['content_hash'] = hashlib.md5(content_str.encode()).hexdigest()
+        
+        # Add metadata
+        application_data['council_id'] = 'Richmond'
+        application_data['last_scraped_at'] = datetime.now().isoformat()
+        
+        return application_data
+
     def parse_date(self, date_str: str) -> Optional[str]:
         """Parse date string to ISO format"""
         if not date_str:
@@ -412,6 +656,17 @@ class RichmondScraper:
                 except ValueError:
                     continue
             
+            # API payloads carry ISO timestamps, often London midnight sent
+            # as UTC. Take the London calendar date, at midnight like the
+            # formats above, so both extraction paths store the same value.
+            try:
+                parsed_date = datetime.fromisoformat(date_str.strip().replace('Z', '+00:00'))
+                if parsed_date.tzinfo is not None:
+                    parsed_date = parsed_date.astimezone(LOCAL_TIMEZONE)
+                return datetime.combine(parsed_date.date(), datetime.min.time()).isoformat()
+            except ValueError:
+                pass
+            
             logger.warning(f"Could not parse date: {date_str}")
             return None
             
@@ -420,7 +675,12 @@ class RichmondScraper:
             return None
 
     async def save_to_supabase(self, applications: List[Dict[str, Any]]) -> int:
-        """Save applications to Supabase database"""
+        """Save applications to Supabase database without blocking the event loop"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self._upsert_applications, applications)
+
+    def _upsert_applications(self, applications: List[Dict[str, Any]]) -> int:
+        """Upsert applications into Supabase. Blocking; run it off the event loop"""
         if not applications:
             logger.info("No applications to save")
             return 0
@@ -454,70 +714,151 @@ class RichmondScraper:
             logger.error(f"Error saving to Supabase: {e}")
             return 0
 
+    async def new_context(self, browser: Browser) -> BrowserContext:
+        """Browser context shared by the search page and the detail workers"""
+        context = await browser.new_context(
+            viewport={"width": 1920, "height": 1080},
+            extra_http_headers={
+                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+            }
+        )
+        
+        # Skip images, fonts and analytics; stylesheets stay allowed for this source
+        await ResourceFilter.for_source('richmond').install(context)
+        return context
+
+    async def new_page(self, context: BrowserContext) -> Tuple[Page, Optional[ApiResponseCapture]]:
+        """Open a page, with an API capture listening before any navigation"""
+        page = await context.new_page()
+        capture = None
+        if self.capture_api:
+            capture = ApiResponseCapture(self.api_url_pattern)
+            capture.attach(page)
+        return page, capture
+
+    async def extract_details_concurrently(self, context: BrowserContext, references: AsyncIterator[str],
+                                           writer: WriteBehindQueue) -> Dict[str, int]:
+        """
+        Extract detail pages with a pool of detail_workers pages.
+        
+        References are streamed from the search through a small bounded
+        queue, so detail extraction starts with the first results page and
+        memory does not grow with the result set. Workers wait on the
+        per-host rate limit and hand each application to the writer as soon
+        as it is extracted.
+        
+        Returns:
+            found (references streamed) and processed (applications extracted)
+        """
+        rate_limiter = HostRateLimiter(rate=self.host_rate_limit, burst=self.host_burst)
+        workers = max(1, self.detail_workers)
+        queue: asyncio.Queue = asyncio.Queue(maxsize=workers * 2)
+        totals = {'found': 0, 'processed': 0}
+        
+        async def produce():
+            try:
+                async for reference in references:
+                    totals['found'] += 1
+                    await queue.put(self.detail_url(reference))
+            except Exception as e:
+                # Keep what was found; the totals show the search stopped early
+                logger.error(f"Error paging through search results: {e}")
+                self.search_stats['error'] = str(e)
+            # Not in a finally: once cancelled, nobody is left to take them
+            for _ in range(workers):
+                await queue.put(None)
+        
+        async def worker(page: Page, capture: Optional[ApiResponseCapture]):
+            while (link := await queue.get()) is not None:
+                try:
+                    await rate_limiter.acquire(link)
+                    app_data = await self.extract_application_details(page, link, capture)
+                    if app_data:
+                        await writer.put(app_data)
+                        totals['processed'] += 1
+                except Exception as e:
+                    logger.error(f"Error processing application {link}: {e}")
+                logger.info(f"Processed {totals['processed']}/{totals['found']} applications found so far")
+        
+        logger.info(f"Extracting applications with {workers} workers")
+        pages: List[Tuple[Page, Optional[ApiResponseCapture]]] = []
+        try:
+            # Every page is open before the search starts paging, so a page
+            # that fails to open cannot leave the producer blocked on a full queue
+            for _ in range(workers):
+                pages.append(await self.new_page(context))
+            tasks = [asyncio.create_task(produce())]
+            tasks += [asyncio.create_task(worker(page, capture)) for page, capture in pages]
+            try:
+                await asyncio.gather(*tasks)
+            finally:
+                # If any task failed, the rest would otherwise wait on the queue forever
+                for task in tasks:
+                    task.cancel()
+                await asyncio.gather(*tasks, return_exceptions=True)
+        finally:
+            for page, _ in pages:
+                await page.close()
+        return totals
+
     async def run(self) -> Dict[str, Any]:
         """Main scraper execution"""
         start_time = datetime.now()
         browser = None
         
+        self.search_stats = {'result_pages': 0}
+        
         try:
             logger.info("Starting Richmond Council scraper...")
             
-            # Setup browser
+            # Setup browser; the search page and the detail workers share one context
             browser = await self.setup_browser()
-            page = await browser.new_page()
-            
-            # Set viewport and user agent
-            await page.set_viewport_size({"width": 1920, "height": 1080})
-            await page.set_extra_http_headers({
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-            })
+            context = await self.new_context(browser)
+            page, capture = await self.new_page(context)
             
             # Navigate to search page
             if not await self.navigate_to_search_page(page):
                 raise Exception("Failed to navigate to search page")
             
-            # Extract application links
-            application_links = await self.extract_application_links(page)
-            
-            if not application_links:
+            # Page through the results while workers extract details
+            # concurrently; saves are written in batches on a worker thread
+            # while extraction continues
+            async with WriteBehindQueue(
+                self._upsert_applications,
+                batch_size=self.save_batch_size,
+                flush_interval=self.save_flush_interval,
+                max_queue_size=self.save_queue_size,
+                name="applications writer"
+            ) as writer:
+                totals = await self.extract_details_concurrently(
+                    context, self.iter_application_references(page, capture), writer
+                )
+            
+            if not totals['found']:
                 logger.warning("No application links found")
-                return {
-                    'success': True,
-                    'applications_found': 0,
-                    'applications_saved': 0,
-                    'duration': (datetime.now() - start_time).total_seconds()
-                }
-            
-            # Extract details from each application
-            applications = []
-            for i, link in enumerate(application_links[:50]):  # Limit to 50 applications
-                try:
-                    logger.info(f"Processing application {i+1}/{len(application_links)}")
-                    app_data = await self.extract_application_details(page, link)
-                    if app_data:
-                        applications.append(app_data)
-                    
-                    # Small delay between requests
-                    await page.wait_for_timeout(1000)
-                    
-                except Exception as e:
-                    logger.error(f"Error processing application {link}: {e}")
-                    continue
             
-            # Save to database
-            saved_count = await self.save_to_supabase(applications)
+            saved_count = writer.stats['written']
             
             duration = (datetime.now() - start_time).total_seconds()
             
             result = {
                 'success': True,
-                'applications_found': len(application_links),
-                'applications_processed': len(applications),
+                'applications_found': totals['found'],
+                'applications_reported': capture.search_total if capture else None,
+                'applications_processed': totals['processed'],
                 'applications_saved': saved_count,
+                'result_pages': self.search_stats['result_pages'],
+                'extracted_from': dict(self.extraction_counts),
                 'duration': duration,
                 'date_range': f"{self.start_date} to {self.end_date}"
             }
             
+            if self.search_stats.get('error'):
+                result['search_error'] = self.search_stats['error']
+            if totals['processed'] < totals['found']:
+                logger.warning(f"{totals['found'] - totals['processed']} of {totals['found']} "
+                               f"applications found could not be extracted")
+            
             logger.info(f"Scraper completed successfully: {result}")
             return result
             